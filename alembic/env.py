@@ -0,0 +1,42 @@
+"""Alembic environment. The database comes from ``DATABASE_URL`` via ``app.database``."""
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, SYNC_DATABASE_URL, engine
+import app.models  # noqa: F401  registers every table on Base.metadata
+
+config = context.config
+# The app runs migrations in-process at startup and keeps its own logging setup
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+# SQLite cannot ALTER most things in place; batch mode rebuilds the table instead
+render_as_batch = SYNC_DATABASE_URL.get_backend_name() == "sqlite"
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting (``alembic upgrade head --sql``)."""
+    context.configure(
+        url=SYNC_DATABASE_URL.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=render_as_batch,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=render_as_batch)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
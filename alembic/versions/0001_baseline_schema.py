@@ -0,0 +1,53 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 23:45:42.662938
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The schema the app created with create_all before migrations existed; columns
+    # and tables added between then and 0002 come in 0001a
+    op.create_table('channel_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('channel_name', sa.String(), nullable=False),
+    sa.Column('channel_id', sa.String(), nullable=True),
+    sa.Column('requester_email', sa.String(), nullable=False),
+    sa.Column('requester_name', sa.String(), nullable=True),
+    sa.Column('visibility', sa.Enum('public', 'private', name='channel_visibility'), nullable=False),
+    sa.Column('users_to_add', sa.JSON(), nullable=True),
+    sa.Column('status', sa.Enum('pending', 'created', 'failed', name='channel_request_status'), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('form_submission_id', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('channel_requests', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_channel_requests_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('channel_requests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_channel_requests_id'))
+
+    op.drop_table('channel_requests')
+    if op.get_context().dialect.name == 'postgresql':
+        # Postgres keeps enum types after their table is dropped
+        op.execute("DROP TYPE IF EXISTS channel_request_status")
+        op.execute("DROP TYPE IF EXISTS channel_visibility")
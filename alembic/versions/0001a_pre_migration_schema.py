@@ -0,0 +1,100 @@
+"""tables and columns added before migrations existed
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18 10:12:07.481530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001a'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Releases between the baseline and 0002 created their schema with create_all, so
+# a database stamped 0001 can have any subset of these. Only what is missing is added.
+COLUMNS = (
+    ('invite_results', sa.JSON()),
+    ('batch_id', sa.String()),
+    ('lease_owner', sa.String()),
+    ('lease_expires_at', sa.DateTime()),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().as_sql:
+        # `alembic upgrade --sql` cannot inspect; emit everything, as for the baseline schema
+        tables, columns, indexes, foreign_keys = set(), set(), set(), []
+    else:
+        inspector = sa.inspect(op.get_bind())
+        tables = set(inspector.get_table_names())
+        columns = {column['name'] for column in inspector.get_columns('channel_requests')}
+        indexes = {index['name'] for index in inspector.get_indexes('channel_requests')}
+        foreign_keys = inspector.get_foreign_keys('channel_requests')
+    if 'channel_batches' not in tables:
+        op.create_table('channel_batches',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('source', sa.String(), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('rejected', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if 'idempotency_keys' not in tables:
+        op.create_table('idempotency_keys',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('channel_name', sa.String(), nullable=False),
+        sa.Column('channel_id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key')
+        )
+
+    # The baseline stored blank and repeated submission IDs; the unique index
+    # keeps the first request for each ID
+    op.execute("UPDATE channel_requests SET form_submission_id = NULL WHERE form_submission_id = ''")
+    op.execute(
+        "UPDATE channel_requests SET form_submission_id = NULL "
+        "WHERE form_submission_id IS NOT NULL AND id NOT IN ("
+        "SELECT MIN(id) FROM channel_requests WHERE form_submission_id IS NOT NULL GROUP BY form_submission_id)"
+    )
+
+    with op.batch_alter_table('channel_requests', schema=None) as batch_op:
+        for name, type_ in COLUMNS:
+            if name not in columns:
+                batch_op.add_column(sa.Column(name, type_, nullable=True))
+        if not any(fk['referred_table'] == 'channel_batches' for fk in foreign_keys):
+            batch_op.create_foreign_key(
+                'fk_channel_requests_batch_id_channel_batches', 'channel_batches', ['batch_id'], ['id'],
+            )
+        if 'ix_channel_requests_batch_id' not in indexes:
+            batch_op.create_index(batch_op.f('ix_channel_requests_batch_id'), ['batch_id'], unique=False)
+        if 'ix_channel_requests_form_submission_id' not in indexes:
+            batch_op.create_index(batch_op.f('ix_channel_requests_form_submission_id'), ['form_submission_id'], unique=True)
+        if 'ix_channel_requests_status_lease' not in indexes:
+            batch_op.create_index('ix_channel_requests_status_lease', ['status', 'lease_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    foreign_keys = sa.inspect(op.get_bind()).get_foreign_keys('channel_requests')
+    with op.batch_alter_table('channel_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_channel_requests_status_lease')
+        batch_op.drop_index(batch_op.f('ix_channel_requests_form_submission_id'))
+        batch_op.drop_index(batch_op.f('ix_channel_requests_batch_id'))
+        # Unnamed when create_all made it; SQLite's table rebuild drops those with the column
+        for fk in foreign_keys:
+            if fk['referred_table'] == 'channel_batches' and fk['name']:
+                batch_op.drop_constraint(fk['name'], type_='foreignkey')
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
+
+    op.drop_table('idempotency_keys')
+    op.drop_table('channel_batches')
@@ -0,0 +1,41 @@
+"""channel request listing indexes
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-17 23:45:44.122065
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    'ix_channel_requests_created_id': ['created_at', 'id'],
+    'ix_channel_requests_status_created_id': ['status', 'created_at', 'id'],
+    'ix_channel_requests_requester_created_id': ['requester_email', 'created_at', 'id'],
+    'ix_channel_requests_channel_name': ['channel_name'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built outside a transaction so Postgres can build them CONCURRENTLY,
+    # without blocking inserts on a large table
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, 'channel_requests', columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='channel_requests', postgresql_concurrently=True)
@@ -0,0 +1,88 @@
+"""Command line entry points.
+
+    python -m app.cli import-channels channels.csv [--process]
+    python -m app.cli archive-requests [--days 90] [--to table|file] [--vacuum]
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from app.config import settings
+from app.database import engine
+from app.logging_config import configure_logging
+from app.migrations import ensure_schema
+from app.services.bulk_import import batch_status, format_for_filename, import_lines
+
+
+async def _process_batch(batch_id: str, interval: float):
+    from app.services.channel_queue import channel_queue
+    from app.services.slack_service import close_async_client
+    from app.services.status_writer import status_writer
+
+    await status_writer.start()
+    await channel_queue.start()
+    try:
+        while True:
+            status = batch_status(batch_id)
+            print(json.dumps(status, default=str), flush=True)
+            if status["complete"]:
+                break
+            channel_queue.notify()
+            await asyncio.sleep(interval)
+    finally:
+        await channel_queue.stop()
+        await status_writer.stop()
+        await close_async_client()
+
+
+def import_channels(args):
+    fmt = args.format or format_for_filename(args.file)
+    if args.file == "-":
+        result = import_lines(sys.stdin, fmt, source="stdin")
+    else:
+        with open(args.file, encoding="utf-8-sig") as f:
+            result = import_lines(f, fmt, source=args.file)
+    print(json.dumps(result))
+
+    if args.process:
+        asyncio.run(_process_batch(result["batch_id"], args.interval))
+
+
+def archive_requests(args):
+    from app.services.retention import run_retention, vacuum
+
+    result = run_retention(args.days, archive=args.to, archive_dir=args.dir, batch_size=args.batch_size)
+    if args.vacuum:
+        vacuum()
+        result["vacuumed"] = True
+    print(json.dumps(result))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    importer = subparsers.add_parser("import-channels", help="Queue channel requests from a CSV or JSON-lines file")
+    importer.add_argument("file", help="Path to the file, or - for stdin")
+    importer.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    importer.add_argument("--process", action="store_true", help="Run the workers in this process until the batch is done")
+    importer.add_argument("--interval", type=float, default=2.0, help="Seconds between progress reports")
+    importer.set_defaults(func=import_channels)
+
+    archiver = subparsers.add_parser("archive-requests", help="Move completed requests past their retention out of channel_requests")
+    archiver.add_argument("--days", type=int, default=settings.retention_days, help="Archive requests completed more than this many days ago")
+    archiver.add_argument("--to", choices=["table", "file"], default=settings.retention_archive, help="channel_requests_archive or gzipped JSON-lines files")
+    archiver.add_argument("--dir", default=settings.retention_archive_dir, help="Directory for --to file")
+    archiver.add_argument("--batch-size", type=int, default=settings.retention_batch_size)
+    archiver.add_argument("--vacuum", action="store_true", help="Then rebuild the database file; on SQLite this blocks writes while it runs")
+    archiver.set_defaults(func=archive_requests)
+
+    args = parser.parse_args(argv)
+    configure_logging()
+    ensure_schema(engine)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
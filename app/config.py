@@ -0,0 +1,118 @@
+"""Application settings, read once from the environment and ``.env``.
+
+Every setting is a field of ``Settings``, read from the environment variable
+of the same name in upper case, e.g. ``channel_workers`` from
+``CHANNEL_WORKERS``. Modules read ``settings`` instead of calling
+``os.getenv`` themselves, so ``.env`` is parsed exactly once per process.
+"""
+import os
+from dataclasses import dataclass, fields
+from typing import Optional
+
+from dotenv import load_dotenv
+
+_TRUE = ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Database
+    database_url: str = "sqlite:///./test.db"
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_sqlite_wal: bool = True
+    # Apply pending migrations at startup; turn off when deploys run `alembic upgrade head`
+    db_auto_migrate: bool = True
+
+    log_level: str = "INFO"
+    # "json" for one JSON object per line, "text" for the plain stdlib format
+    log_format: str = "json"
+    # Records buffered for the log writer thread; further records are dropped while it is full
+    log_queue_size: int = 10000
+    # Fraction of DEBUG records kept
+    log_debug_sample_rate: float = 1
+
+    # Slack workspaces and HTTP
+    slack_bot_token: Optional[str] = None
+    slack_signing_secret: Optional[str] = None
+    # Point at a stand-in Slack Web API, e.g. benchmarks/fake_slack.py
+    slack_api_base_url: str = "https://slack.com/api/"
+    slack_http_pool_size: int = 100
+    slack_http_timeout: int = 30
+    # Bot tokens of additional workspaces: "T0123:xoxb-...,T0456:xoxb-..."
+    slack_workspace_tokens: str = ""
+    slack_workspace_idle_ttl: float = 3600
+    slack_workspace_max: int = 100
+    slack_signature_max_age: int = 300
+    slack_max_body_bytes: int = 1024 * 1024
+
+    # Slack rate limits and caches
+    # Scale every tier up or down, e.g. for a workspace with raised limits or a fake API
+    slack_rate_limit_scale: float = 1
+    slack_rate_limit_max_retries: int = 20
+    slack_user_cache_size: int = 10000
+    slack_user_cache_ttl: float = 3600
+    slack_user_cache_negative_ttl: float = 300
+    # Seconds between users.list sweeps that refresh the user cache; 0 disables the warmer
+    # unless slack_user_cache_warm_on_startup is set, in which case it loads once at startup
+    slack_user_cache_warm_interval: float = 0
+    slack_user_cache_warm_on_startup: bool = False
+    # Seconds between conversations.list sweeps of the channel name index; 0 loads it once at startup
+    slack_channel_index_refresh_interval: float = 3600
+    # Users per conversations.invite call (Slack accepts at most 1000) and attempts per user
+    slack_invite_chunk_size: int = 100
+    slack_invite_max_attempts: int = 3
+
+    # Channel request processing
+    channel_workers: int = 4
+    channel_queue_poll_interval: float = 5
+    channel_lease_seconds: float = 60
+    # Processing attempts before a request that keeps failing transiently is dead-lettered
+    channel_max_attempts: int = 5
+    # Retry backoff: doubles from the base delay per attempt, capped, with jitter
+    channel_retry_base_delay: float = 30
+    channel_retry_max_delay: float = 3600
+    status_flush_interval: float = 0.2
+    status_flush_size: int = 200
+    # Failed flushes before a row's update is dropped and its waiters fail; its lease then lapses
+    status_flush_max_attempts: int = 5
+    bulk_insert_chunk_size: int = 500
+    forms_batch_max_items: int = 500
+
+    # Retention of completed channel requests; 0 days keeps them in the hot table forever
+    retention_days: int = 90
+    # "table" (channel_requests_archive) or "file" (gzipped JSON lines in retention_archive_dir)
+    retention_archive: str = "table"
+    retention_archive_dir: str = "./archive"
+    # Rows archived per transaction, and the pause between batches that lets request writes in
+    retention_batch_size: int = 500
+    retention_batch_pause: float = 0.05
+    # Seconds between background sweeps; 0 leaves retention to `python -m app.cli archive-requests`
+    retention_interval: float = 3600
+
+    @classmethod
+    def from_env(cls, environ=os.environ) -> "Settings":
+        """Build settings from ``environ``; unset (or empty numeric) variables keep their defaults."""
+        values = {}
+        for field in fields(cls):
+            raw = environ.get(field.name.upper())
+            if raw is None or (not raw.strip() and field.type in (int, float, bool)):
+                continue
+            values[field.name] = _parse(field.type, raw.strip())
+        return cls(**values)
+
+
+def _parse(type_, raw: str):
+    if type_ is bool:
+        return raw.lower() in _TRUE
+    if type_ is int:
+        return int(raw)
+    if type_ is float:
+        return float(raw)
+    return raw
+
+
+load_dotenv()
+settings = Settings.from_env()
@@ -1,12 +1,85 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
-from dotenv import load_dotenv
-import os
+from app.config import settings
 
-load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+DATABASE_URL = settings.database_url
+DB_POOL_SIZE = settings.db_pool_size
+DB_MAX_OVERFLOW = settings.db_max_overflow
+DB_POOL_TIMEOUT = settings.db_pool_timeout
+DB_POOL_RECYCLE = settings.db_pool_recycle
+DB_SQLITE_WAL = settings.db_sqlite_wal
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Async driver used for each backend when DATABASE_URL names a sync one, and vice versa
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+SYNC_DRIVERS = {"sqlite": "pysqlite", "postgresql": "psycopg2", "mysql": "pymysql"}
+
+
+def _engine_urls(url: str):
+    """Return ``(sync_url, async_url)`` for one configured database URL.
+
+    Either flavour may be configured, e.g. ``sqlite:///./app.db`` or
+    ``postgresql+asyncpg://...``; the other is derived from it.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() in ASYNC_DRIVERS.values():
+        return url.set(drivername=f"{backend}+{SYNC_DRIVERS[backend]}"), url
+    return url, url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def _engine_args(url) -> dict:
+    if url.get_backend_name() == "sqlite":
+        args = {"connect_args": {"check_same_thread": False}}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; pooling does not apply
+            return args
+    else:
+        args = {"pool_pre_ping": True}
+    args.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return args
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside the single writer; NORMAL sync is durable under WAL
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+SYNC_DATABASE_URL, ASYNC_DATABASE_URL = _engine_urls(DATABASE_URL)
+
+engine = create_engine(SYNC_DATABASE_URL, **_engine_args(SYNC_DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_engine_args(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+if SYNC_DATABASE_URL.get_backend_name() == "sqlite" and DB_SQLITE_WAL:
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
 Base = declarative_base()
+
+
+# Dependency to get DB session
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency to get an async DB session, for async handlers
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
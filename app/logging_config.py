@@ -0,0 +1,160 @@
+"""Non-blocking, structured logging.
+
+Loggers hand records to a bounded in-memory queue and return. A background
+``QueueListener`` thread then formats them (JSON by default), redacts
+secrets and writes them to stderr. A slow or blocked stream therefore never
+stalls a request. If the queue fills up, new records are dropped and counted
+in ``log_records_dropped_total``.
+
+Each record carries the fields bound with ``log_context``: the request ID set
+by ``RequestContextMiddleware`` and, inside the channel queue workers, the
+``channel_request_id``. Records are only formatted on the listener thread, so
+pass values as ``%s`` arguments rather than pre-formatting them with f-strings.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.config import settings
+from app.services.metrics import Gauge, log_records_dropped_total
+
+# Fields bound to the current request or task; replaced, never mutated
+_context: contextvars.ContextVar[dict] = contextvars.ContextVar("log_context", default={})
+
+# Secrets that must never reach the logs, with their replacements
+REDACTIONS = (
+    (re.compile(r"\b(xox[a-z]|xapp)-[A-Za-z0-9-]+"), r"\1-[REDACTED]"),
+    # response_url and incoming webhook URLs can post into the workspace
+    (re.compile(r"https://hooks\.slack\.com/\S+"), "https://hooks.slack.com/[REDACTED]"),
+    (re.compile(r"\bv0=[0-9a-f]{64}\b"), "v0=[REDACTED]"),
+)
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "context"}
+
+# Loggers that install their own handlers and would otherwise write synchronously
+_SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue: Optional[queue.Queue] = None
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach ``fields`` to every record logged inside the block, in this task or thread."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def redact(text: str) -> str:
+    for pattern, replacement in REDACTIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class RedactingFormatter(logging.Formatter):
+    """The stdlib text format, with the request context appended and secrets redacted."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        context = getattr(record, "context", None)
+        if context:
+            text += " " + " ".join(f"{key}={value}" for key, value in context.items())
+        return redact(text)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, context fields and extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(record.getMessage()),
+        }
+        entry.update(getattr(record, "context", None) or {})
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = redact(self.formatException(record.exc_info))
+        elif record.exc_text:
+            entry["exception"] = redact(record.exc_text)
+        return json.dumps(entry, default=str)
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records with their context, without formatting them on the caller's thread."""
+
+    def __init__(self, log_queue: queue.Queue, debug_sample_rate: float = 1.0):
+        super().__init__(log_queue)
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and self.debug_sample_rate < 1 and random.random() >= self.debug_sample_rate:
+            return False
+        return super().filter(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The queue stays in-process, so the record needs no pickling; formatting
+        # (including tracebacks) is left to the listener thread
+        record.context = _context.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped_total.labels(record.levelname).inc()
+
+
+def configure_logging(
+    level: str = settings.log_level,
+    fmt: str = settings.log_format,
+    queue_size: int = settings.log_queue_size,
+    debug_sample_rate: float = settings.log_debug_sample_rate,
+):
+    """Route the root logger (and uvicorn's) through the queue. Safe to call more than once."""
+    global _listener, _queue
+    if _listener is not None:
+        return
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else RedactingFormatter(logging.BASIC_FORMAT))
+    _queue = queue.Queue(maxsize=queue_size)
+    _listener = logging.handlers.QueueListener(_queue, stream, respect_handler_level=False)
+    _listener.start()
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(ContextQueueHandler(_queue, debug_sample_rate))
+    root.setLevel(level)
+    for name in _SERVER_LOGGERS:
+        server_logger = logging.getLogger(name)
+        server_logger.handlers.clear()
+        server_logger.propagate = True
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+Gauge("log_queue_depth", "Log records waiting to be written", callback=lambda: _queue.qsize() if _queue else 0)
@@ -0,0 +1,173 @@
+"""ASGI middleware: request IDs for logging, and Slack signature verification.
+
+Slack signs every slash command and interaction with
+``v0=HMAC-SHA256(signing_secret, "v0:{timestamp}:{raw body}")``. The check
+runs on the raw bytes before FastAPI parses anything. Requests with missing,
+stale or malformed headers are answered with a pre-built 401 without reading
+the body. A verified body is replayed to the app, so ``Form(...)`` and
+``request.form()`` parse it as usual.
+"""
+import hashlib
+import hmac
+import logging
+import re
+import time
+import uuid
+
+from app.config import settings
+from app.logging_config import log_context
+from app.services.metrics import slack_signature_rejected_total
+
+SLACK_SIGNATURE_MAX_AGE = settings.slack_signature_max_age
+SLACK_MAX_BODY_BYTES = settings.slack_max_body_bytes
+
+logger = logging.getLogger(__name__)
+
+# "v0=" followed by a hex SHA-256 digest
+_SIGNATURE_LENGTH = 3 + 64
+
+
+def _prebuilt_response(status: int, detail: str) -> tuple[dict, dict]:
+    body = b'{"detail":"' + detail.encode() + b'"}'
+    start = {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    return start, {"type": "http.response.body", "body": body}
+
+
+_UNAUTHORIZED = _prebuilt_response(401, "Invalid Slack signature")
+_TOO_LARGE = _prebuilt_response(413, "Request body too large")
+
+
+# Caller-supplied request IDs are only trusted if they look like one
+_REQUEST_ID = re.compile(rb"[A-Za-z0-9._-]{1,64}")
+
+
+class RequestContextMiddleware:
+    """Bind a request ID to every log record of a request and echo it as ``X-Request-ID``.
+
+    The ID comes from the caller's ``X-Request-ID`` header when it is well formed,
+    and is generated otherwise.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id" and _REQUEST_ID.fullmatch(value):
+                request_id = value
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex.encode()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (b"x-request-id", request_id)]
+            await send(message)
+
+        with log_context(request_id=request_id.decode()):
+            await self.app(scope, receive, send_with_id)
+
+
+class SlackSignatureMiddleware:
+    """Reject requests under ``path_prefix`` that do not carry a valid Slack signature."""
+
+    def __init__(
+        self,
+        app,
+        signing_secret: str,
+        path_prefix: str = "/slack/",
+        max_age: int = SLACK_SIGNATURE_MAX_AGE,
+        max_body: int = SLACK_MAX_BODY_BYTES,
+    ):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_age = max_age
+        self.max_body = max_body
+        self._key = signing_secret.encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        signature = timestamp = length = None
+        for name, value in scope["headers"]:
+            if name == b"x-slack-signature":
+                signature = value
+            elif name == b"x-slack-request-timestamp":
+                timestamp = value
+            elif name == b"content-length":
+                length = value
+
+        reason = self._check_headers(signature, timestamp, length)
+        if reason is not None:
+            await self._reject(send, reason)
+            return
+
+        message = await receive()
+        body = message.get("body", b"")
+        if message.get("more_body"):
+            chunks = [body]
+            size = len(body)
+            while message.get("more_body"):
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                chunks.append(message.get("body", b""))
+                size += len(chunks[-1])
+                if size > self.max_body:
+                    await self._reject(send, "too_large")
+                    return
+            body = b"".join(chunks)
+        elif message["type"] == "http.disconnect":
+            return
+
+        expected = hmac.new(self._key, b"v0:" + timestamp + b":" + body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(signature[3:], expected.encode()):
+            await self._reject(send, "bad_signature")
+            return
+
+        await self.app(scope, _replay(body, receive), send)
+
+    def _check_headers(self, signature, timestamp, length):
+        if signature is None or timestamp is None:
+            return "missing_headers"
+        if len(signature) != _SIGNATURE_LENGTH or not signature.startswith(b"v0="):
+            return "malformed_signature"
+        if not timestamp.isdigit() or abs(time.time() - int(timestamp)) > self.max_age:
+            # Also guards against replays of captured requests
+            return "stale_timestamp"
+        if length is not None and (not length.isdigit() or int(length) > self.max_body):
+            return "too_large"
+        return None
+
+    @staticmethod
+    async def _reject(send, reason: str):
+        slack_signature_rejected_total.labels(reason).inc()
+        logger.debug("Rejected Slack request: %s", reason)
+        start, body = _TOO_LARGE if reason == "too_large" else _UNAUTHORIZED
+        await send(start)
+        await send(body)
+
+
+def _replay(body: bytes, receive):
+    """A ``receive`` that hands out the already-read body once, then defers to the server."""
+    replayed = False
+
+    async def replay():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
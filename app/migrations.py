@@ -0,0 +1,91 @@
+"""Startup check that the database schema is at the latest Alembic revision.
+
+The check reads ``alembic_version`` once and compares it with the head of
+``alembic/versions``, which is found by scanning the scripts' headers rather
+than importing Alembic. Alembic is only loaded when migrations need to be
+applied. With ``DB_AUTO_MIGRATE`` that happens at startup; without it, a
+database that is behind stops the process.
+"""
+import logging
+import re
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+ROOT = Path(__file__).resolve().parent.parent
+ALEMBIC_INI = ROOT / "alembic.ini"
+VERSIONS_DIR = ROOT / "alembic" / "versions"
+
+_REVISION = re.compile(r"^revision\b[^=]*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision\b[^=]*=(.*)$", re.MULTILINE)
+_QUOTED = re.compile(r"['\"]([^'\"]+)['\"]")
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaError(RuntimeError):
+    """The database schema does not match this code and was not migrated."""
+
+
+def script_revisions(versions_dir: Path = VERSIONS_DIR) -> tuple[str, set[str]]:
+    """Return ``(head, all revisions)`` of the migration scripts in ``versions_dir``."""
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        match = _REVISION.search(source)
+        if match is None:
+            continue
+        revisions.add(match.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down is not None:
+            parents.update(_QUOTED.findall(down.group(1)))
+    heads = revisions - parents
+    if len(heads) != 1:
+        raise SchemaError(f"Expected one migration head in {versions_dir}, found {sorted(heads)}")
+    return heads.pop(), revisions
+
+
+def current_revision(engine: Engine) -> tuple[Optional[str], bool]:
+    """Return the database's Alembic revision and whether it has any tables at all."""
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        if not inspector.has_table("alembic_version"):
+            return None, bool(inspector.get_table_names())
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar(), True
+
+
+def upgrade_to_head():
+    """Run ``alembic upgrade head`` in this process."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    # Keep the app's logging setup instead of alembic.ini's
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+
+
+def ensure_schema(engine: Engine, auto_migrate: bool = settings.db_auto_migrate):
+    """Check the schema revision, migrating to head when allowed; raise ``SchemaError`` otherwise."""
+    head, revisions = script_revisions()
+    current, has_tables = current_revision(engine)
+    if current == head:
+        return
+    if current is None and has_tables:
+        raise SchemaError(
+            "Database has tables but no Alembic revision. If it was created by an older "
+            "release with create_all, run `alembic stamp 0001` and then `alembic upgrade head`; "
+            "revision 0001a adds whatever that release's schema is missing."
+        )
+    if current is not None and current not in revisions:
+        # A newer release has already migrated it, e.g. during a rolling deploy
+        logger.warning("Database schema revision %s is newer than this code's head %s", current, head)
+        return
+    if not auto_migrate:
+        raise SchemaError(f"Database schema is at {current or 'empty'}, expected {head}; run `alembic upgrade head`")
+    logger.info("Migrating database schema from %s to %s", current or "empty", head)
+    upgrade_to_head()
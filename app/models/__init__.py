@@ -1 +1,5 @@
 from .channel_request import ChannelRequest
+from .channel_batch import ChannelBatch
+from .idempotency_key import IdempotencyKey
+from .channel_request_archive import ChannelRequestArchive
+from .archived_submission import ArchivedSubmission
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.database import Base
+
+class ArchivedSubmission(Base):
+    """The form submission ID of a request that retention moved out of ``channel_requests``.
+
+    Written in the same transaction as the archive, whichever archive is used,
+    and never deleted, so a replayed submission is still recognised once its
+    request has been archived.
+    """
+    __tablename__ = "archived_submissions"
+
+    form_submission_id = Column(String, primary_key=True)
+    request_id = Column(Integer, nullable=False)
+    channel_name = Column(String, nullable=False)
+    channel_id = Column(String, nullable=True)
+    status = Column(String, nullable=False)
+    created_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
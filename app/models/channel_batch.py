@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from app.database import Base
+
+class ChannelBatch(Base):
+    __tablename__ = "channel_batches"
+
+    id = Column(String, primary_key=True)
+    source = Column(String, nullable=True)
+    total = Column(Integer, default=0)
+    rejected = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
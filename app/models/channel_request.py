@@ -1,19 +1,44 @@
-from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, Enum, DateTime, Text, JSON, ForeignKey, Index
 from datetime import datetime
 from app.database import Base
 
 class ChannelRequest(Base):
     __tablename__ = "channel_requests"
+    __table_args__ = (
+        # Workers scan for pending rows whose lease is free or expired
+        Index("ix_channel_requests_status_lease", "status", "lease_expires_at"),
+        # Keyset pagination of GET /requests, unfiltered and by its equality filters
+        Index("ix_channel_requests_created_id", "created_at", "id"),
+        Index("ix_channel_requests_status_created_id", "status", "created_at", "id"),
+        Index("ix_channel_requests_requester_created_id", "requester_email", "created_at", "id"),
+        Index("ix_channel_requests_channel_name", "channel_name"),
+        # Retention finds completed rows past their retention period
+        Index("ix_channel_requests_completed_at", "completed_at"),
+        # Never hand out an archived request's ID again (SQLite reuses the highest
+        # rowid once it is deleted)
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     channel_name = Column(String, nullable=False)
     channel_id = Column(String, nullable=True)
     requester_email = Column(String, nullable=False)
     requester_name = Column(String, nullable=True)
-    visibility = Column(Enum('public', 'private'), nullable=False)
+    visibility = Column(Enum('public', 'private', name='channel_visibility'), nullable=False)
     users_to_add = Column(JSON, nullable=True)
-    status = Column(Enum('pending', 'created', 'failed'), default='pending')
+    # Per-email invite outcome: {email: {"user_id", "status", "error"}}
+    invite_results = Column(JSON, nullable=True)
+    # dead_letter: failed transiently CHANNEL_MAX_ATTEMPTS times; see app.services.retries
+    status = Column(Enum('pending', 'created', 'failed', 'dead_letter', name='channel_request_status'), default='pending')
     error_message = Column(Text, nullable=True)
-    form_submission_id = Column(String, nullable=True)
+    form_submission_id = Column(String, nullable=True, unique=True, index=True)
+    batch_id = Column(String, ForeignKey("channel_batches.id"), nullable=True, index=True)
+    # Slack workspace; NULL means the default workspace
+    team_id = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    # Finished processing attempts, and when a request waiting to be retried is due
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime, nullable=True)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from datetime import datetime
+from app.database import Base
+
+class ChannelRequestArchive(Base):
+    """A completed ``channel_requests`` row moved out of the hot table by retention.
+
+    The columns used to find a request are kept as they were. The rest
+    (users, invite results, error text, ...) are stored as one
+    zlib-compressed JSON document in ``payload``; see ``app.services.retention``.
+    """
+    __tablename__ = "channel_requests_archive"
+
+    # Same ID the request had in channel_requests
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    channel_name = Column(String, nullable=False)
+    channel_id = Column(String, nullable=True)
+    requester_email = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    team_id = Column(String, nullable=True)
+    batch_id = Column(String, nullable=True)
+    form_submission_id = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(LargeBinary, nullable=False)
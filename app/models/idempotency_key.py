@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from app.database import Base
+
+class IdempotencyKey(Base):
+    """Result of a ``POST /create-channel`` call made with an ``Idempotency-Key`` header."""
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    channel_name = Column(String, nullable=False)
+    channel_id = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,3 +1,3 @@
-from . import forms, slack
+from . import forms, slack, channels, channel_requests, metrics, admin
 
-__all__ = ["forms", "slack"]
+__all__ = ["forms", "slack", "channels", "channel_requests", "metrics", "admin"]
@@ -0,0 +1,47 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.channel_request import ChannelRequest
+from app.schemas.channel import ChannelRequestDetail, ChannelRequestPage
+from app.services.channel_queue import channel_queue
+from app.services.request_listing import MAX_PAGE_SIZE, list_requests
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# Final statuses an operator can send back to the queue
+RETRYABLE_STATUSES = ('failed', 'dead_letter')
+
+@router.get("/dead-letter", response_model=ChannelRequestPage)
+async def get_dead_letters(
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Requests that ran out of retries, newest first; ``error_message`` holds the last error."""
+    try:
+        items, next_cursor = await list_requests(db, status='dead_letter', limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.post("/requests/{request_id}/retry", response_model=ChannelRequestDetail)
+async def retry_request(request_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Send a failed or dead-lettered request back to the queue with a fresh set of attempts.
+
+    Steps that already succeeded (the channel, invited users) are not repeated.
+    """
+    result = await db.execute(
+        update(ChannelRequest)
+        .where(ChannelRequest.id == request_id, ChannelRequest.status.in_(RETRYABLE_STATUSES))
+        .values(status='pending', attempts=0, next_attempt_at=None, error_message=None, completed_at=None)
+    )
+    await db.commit()
+    req = await db.get(ChannelRequest, request_id)
+    if req is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    if result.rowcount == 0:
+        raise HTTPException(status_code=409, detail=f"Request is {req.status}, only failed or dead-lettered requests can be retried")
+    channel_queue.notify()
+    return req
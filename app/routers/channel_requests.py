@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.channel_request import ChannelRequest
+from app.schemas.channel import ChannelRequestDetail, ChannelRequestPage
+from app.services.request_listing import MAX_PAGE_SIZE, list_requests
+
+router = APIRouter(prefix="/requests", tags=["requests"])
+
+@router.get("", response_model=ChannelRequestPage)
+async def get_requests(
+    status: Optional[Literal['pending', 'created', 'failed', 'dead_letter']] = None,
+    requester: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    channel_prefix: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List channel requests, newest first. Pass ``next_cursor`` back as ``cursor`` for the next page."""
+    try:
+        items, next_cursor = await list_requests(
+            db,
+            status=status,
+            requester=requester,
+            created_after=created_after,
+            created_before=created_before,
+            channel_prefix=channel_prefix,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{request_id}", response_model=ChannelRequestDetail)
+async def get_request(request_id: int, db: AsyncSession = Depends(get_async_db)):
+    req = await db.get(ChannelRequest, request_id)
+    if req is None:
+        raise HTTPException(status_code=404, detail="Request not found")
+    return req
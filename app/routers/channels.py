@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+from app.schemas.channel import BulkImportResponse, BatchStatusResponse
+from app.services.bulk_import import (
+    BatchImport,
+    batch_status,
+    create_batch,
+    format_for_content_type,
+    insert_specs,
+    iter_lines,
+    record_rejected,
+)
+from app.services.channel_queue import channel_queue
+import logging
+
+router = APIRouter(prefix="/channels", tags=["channels"])
+logger = logging.getLogger(__name__)
+
+@router.post("/bulk", response_model=BulkImportResponse)
+async def bulk_create_channels(request: Request, source: str = None):
+    """Queue many channel requests from a streamed CSV (text/csv) or JSON-lines body."""
+    fmt = format_for_content_type(request.headers.get("content-type"))
+    batch_id = await run_in_threadpool(create_batch, source)
+    importer = BatchImport(batch_id, fmt)
+
+    async for line in iter_lines(request.stream()):
+        chunk = importer.add_line(line)
+        if chunk:
+            importer.inserted(await run_in_threadpool(insert_specs, batch_id, chunk))
+            channel_queue.notify()
+    importer.inserted(await run_in_threadpool(insert_specs, batch_id, importer.take_chunk()))
+    await run_in_threadpool(record_rejected, batch_id, importer.rejected)
+    channel_queue.notify()
+
+    logger.info("Queued batch %s: %s accepted, %s rejected", batch_id, importer.accepted, importer.rejected)
+    return importer.result()
+
+@router.get("/bulk/{batch_id}", response_model=BatchStatusResponse)
+async def bulk_status(batch_id: str):
+    """Report progress of a bulk import batch."""
+    status = await run_in_threadpool(batch_status, batch_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return status
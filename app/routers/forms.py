@@ -1,24 +1,66 @@
+from typing import Any, Dict, List
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.schemas.channel import ChannelRequestCreate, ChannelRequestResponse
+from pydantic import ValidationError
+from sqlalchemy import String, cast, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db
+from app.schemas.channel import (
+    BatchSubmissionResponse,
+    ChannelRequestCreate,
+    ChannelRequestResponse,
+)
+from app.models.archived_submission import ArchivedSubmission
 from app.models.channel_request import ChannelRequest
-from app.services.slack_service import create_channel, lookup_user, invite_users
+from app.services.channel_queue import channel_queue
+from app.services.slack_service import check_channel_name
 import logging
 
+FORMS_BATCH_MAX_ITEMS = settings.forms_batch_max_items
+
 router = APIRouter(prefix="/forms", tags=["forms"])
 logger = logging.getLogger(__name__)
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def _find_submission(db: AsyncSession, form_submission_id: str):
+    result = await db.execute(
+        select(ChannelRequest).where(ChannelRequest.form_submission_id == form_submission_id)
+    )
+    req = result.scalars().first()
+    if req is not None:
+        return req
+    # Requests past their retention period live on as their submission ID
+    archived = await db.get(ArchivedSubmission, form_submission_id)
+    if archived is None:
+        return None
+    # Not added to the session; only answers the replay
+    return ChannelRequest(
+        id=archived.request_id,
+        channel_name=archived.channel_name,
+        channel_id=archived.channel_id,
+        status=archived.status,
+        created_at=archived.created_at,
+    )
 
 @router.post("/webhook", response_model=ChannelRequestResponse)
-async def forms_webhook(payload: ChannelRequestCreate, db: Session = Depends(get_db)):
+async def forms_webhook(payload: ChannelRequestCreate, db: AsyncSession = Depends(get_async_db)):
+    # Replayed submissions (Apps Script retries, double submits) return the original request
+    if payload.form_submission_id:
+        existing = await _find_submission(db, payload.form_submission_id)
+        if existing is not None:
+            logger.info(
+                "Duplicate submission %s, returning request %s",
+                payload.form_submission_id,
+                existing.id,
+                extra={"channel_request_id": existing.id},
+            )
+            return existing
+
+    # Reject invalid or taken names before they reach the queue
+    problem = check_channel_name(payload.channel_name, payload.team_id)
+    if problem is not None:
+        raise HTTPException(status_code=422, detail={"error": problem.error, "suggestions": problem.suggestions})
+
     # Store request in DB
     req = ChannelRequest(
         channel_name=payload.channel_name,
@@ -27,28 +69,139 @@ async def forms_webhook(payload: ChannelRequestCreate, db: Session = Depends(get
         visibility=payload.visibility,
         users_to_add=payload.users_to_add,
         form_submission_id=payload.form_submission_id,
+        team_id=payload.team_id,
     )
     db.add(req)
-    db.commit()
-    db.refresh(req)
-    logger.info("Stored channel request %s", req.id)
-
-    # Channel creation workflow
     try:
-        channel_id = create_channel(req.channel_name, req.visibility == 'private')
-        req.channel_id = channel_id
-        req.status = 'created'
-        if req.users_to_add:
-            user_ids = []
-            for email in req.users_to_add:
-                user_ids.append(lookup_user(email))
-            invite_users(channel_id, user_ids)
-    except Exception as e:
-        req.status = 'failed'
-        req.error_message = str(e)
-        db.commit()
-        logger.error("Channel creation failed: %s", e)
-        raise HTTPException(status_code=500, detail=str(e))
-
-    db.commit()
+        # The only commit on this path; the row is complete as inserted
+        await db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent delivery of the same submission
+        await db.rollback()
+        if payload.form_submission_id is None:
+            raise
+        return await _find_submission(db, payload.form_submission_id)
+    logger.info("Stored channel request %s", req.id, extra={"channel_request_id": req.id})
+
+    # Channel creation runs on the background workers; the row is the queue entry
+    channel_queue.notify()
     return req
+
+async def _find_submissions(db: AsyncSession, form_submission_ids: set[str]) -> dict:
+    if not form_submission_ids:
+        return {}
+    result = await db.execute(
+        # Postgres only unions the enum status with the archive's plain string once cast
+        select(ChannelRequest.id, cast(ChannelRequest.status, String).label("status"), ChannelRequest.form_submission_id)
+        .where(ChannelRequest.form_submission_id.in_(form_submission_ids))
+        .union_all(
+            select(ArchivedSubmission.request_id, ArchivedSubmission.status, ArchivedSubmission.form_submission_id)
+            .where(ArchivedSubmission.form_submission_id.in_(form_submission_ids))
+        )
+    )
+    return {row.form_submission_id: row for row in result}
+
+async def _insert_submissions(db: AsyncSession, items: list[ChannelRequestCreate]) -> list[int]:
+    if not items:
+        return []
+    rows = [
+        {
+            "channel_name": item.channel_name,
+            "requester_email": item.requester_email,
+            "requester_name": item.requester_name,
+            "visibility": item.visibility,
+            "users_to_add": item.users_to_add,
+            "form_submission_id": item.form_submission_id,
+            "team_id": item.team_id,
+            "status": "pending",
+        }
+        for item in items
+    ]
+    result = await db.execute(
+        insert(ChannelRequest).returning(ChannelRequest.id, sort_by_parameter_order=True), rows
+    )
+    return list(result.scalars())
+
+def _validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in error.errors())
+
+@router.post("/webhook/batch", response_model=BatchSubmissionResponse)
+async def forms_webhook_batch(payload: List[Dict[str, Any]], db: AsyncSession = Depends(get_async_db)):
+    """Store many form submissions with one bulk insert, returning a result per item.
+
+    Each item is handled as ``/webhook`` would handle it. A replayed submission
+    returns the stored request, and an invalid item or a bad channel name
+    rejects only its own item.
+    """
+    if len(payload) > FORMS_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {FORMS_BATCH_MAX_ITEMS} submissions per batch")
+
+    results = [None] * len(payload)
+    items = [None] * len(payload)
+    valid = []
+    for index, raw in enumerate(payload):
+        # Validated one by one, so a malformed submission cannot hold up the rest
+        try:
+            items[index] = ChannelRequestCreate(**raw)
+        except ValidationError as e:
+            results[index] = {"index": index, "status": "rejected", "error": _validation_error(e)}
+            continue
+        valid.append(index)
+
+    name_problems = {}
+    for attempt in (1, 2):
+        stored = await _find_submissions(
+            db, {items[i].form_submission_id for i in valid if items[i].form_submission_id}
+        )
+        new = []
+        first_in_batch = {}
+        for index in valid:
+            item = items[index]
+            submission_id = item.form_submission_id
+            if submission_id in stored:
+                # Checked before the name: a replay's channel is already taken by itself
+                row = stored[submission_id]
+                results[index] = {"index": index, "id": row.id, "status": row.status, "duplicate": True}
+                continue
+            if submission_id in first_in_batch:
+                continue
+            # Reject invalid or taken names before they reach the queue
+            if index not in name_problems:
+                name_problems[index] = check_channel_name(item.channel_name, item.team_id)
+            problem = name_problems[index]
+            if problem is not None:
+                results[index] = {
+                    "index": index, "status": "rejected", "error": problem.error, "suggestions": problem.suggestions
+                }
+                continue
+            if submission_id:
+                first_in_batch[submission_id] = index
+            new.append(index)
+        try:
+            ids = await _insert_submissions(db, [items[i] for i in new])
+            await db.commit()
+            break
+        except IntegrityError:
+            # A concurrent delivery stored some of these first; look them up again
+            await db.rollback()
+            if attempt == 2:
+                raise
+
+    for index, request_id in zip(new, ids):
+        results[index] = {"index": index, "id": request_id, "status": "pending"}
+    for index in valid:
+        if results[index] is None:
+            # A repeat of a submission earlier in this batch
+            first = results[first_in_batch[items[index].form_submission_id]]
+            results[index] = {"index": index, "id": first["id"], "status": first["status"], "duplicate": True}
+
+    if ids:
+        logger.info("Stored %s channel requests from a batch of %s", len(ids), len(payload))
+        channel_queue.notify()
+    rejected = sum(result["status"] == "rejected" for result in results)
+    return {
+        "accepted": len(ids),
+        "duplicates": len(payload) - len(ids) - rejected,
+        "rejected": rejected,
+        "items": results,
+    }
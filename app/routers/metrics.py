@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from app.services.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Expose metrics in the Prometheus text format."""
+    # Some gauges query the database, so render off the event loop
+    body = await run_in_threadpool(render_metrics)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
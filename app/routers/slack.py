@@ -1,39 +1,77 @@
-from fastapi import APIRouter, HTTPException, Request, Form, Depends
-from app.services.slack_service import create_channel, token_info, open_channel_creation_modal, send_delayed_response, client
+from fastapi import APIRouter, HTTPException, Request, Form, Depends, Header, BackgroundTasks, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.idempotency_key import IdempotencyKey
+from app.services.slack_service import (
+    create_channel_async,
+    invite_users_async,
+    INVITE_OK,
+    token_info_async,
+    open_channel_creation_modal_async,
+    send_delayed_response_async,
+    get_async_client,
+    update_view_async,
+    check_channel_name,
+    ChannelNameError,
+    channel_result_view,
+)
+from app.services.templates import templates
+from app.services.channel_names import normalize_channel_name
+from app.services.rate_limiter import scheduler, PRIORITY_INTERACTIVE
+from app.services.metrics import interaction_ack_seconds
 from app.schemas.channel import CreateChannelRequest, CreateChannelResponse, TokenInfoResponse
 from app.schemas.slack_command import SlackCommandResponse, SlackSlashCommandRequest
 from app.schemas.slack_interaction import SlackInteractionPayload
 import logging
 from typing import Optional
-import hmac
-import hashlib
 import time
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-SLACK_SIGNING_SECRET = os.getenv('SLACK_SIGNING_SECRET')
 
 router = APIRouter(tags=["slack"])
 logger = logging.getLogger(__name__)
 
 @router.post("/create-channel", response_model=CreateChannelResponse)
-async def create_channel_endpoint(payload: CreateChannelRequest):
-    """Create a Slack channel directly via API."""
+async def create_channel_endpoint(
+    payload: CreateChannelRequest,
+    idempotency_key: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create a Slack channel directly via API.
+
+    With an ``Idempotency-Key`` header, a replay of a successful call returns
+    the original result without calling Slack again.
+    """
+    if idempotency_key:
+        record = await db.get(IdempotencyKey, idempotency_key)
+        if record is not None:
+            return CreateChannelResponse(channel_name=record.channel_name, channel_id=record.channel_id)
+
     is_private = payload.channel_type.lower() == "private"
     try:
-        channel_id = create_channel(payload.channel_name, is_private)
-        return CreateChannelResponse(channel_name=payload.channel_name, channel_id=channel_id)
+        channel_id = await create_channel_async(
+            payload.channel_name, is_private, priority=PRIORITY_INTERACTIVE, team_id=payload.team_id
+        )
+    except ChannelNameError as e:
+        status_code = 409 if e.error == "name_taken" else 422
+        raise HTTPException(status_code=status_code, detail={"error": e.error, "suggestions": e.suggestions})
     except Exception as e:
         logger.error("Channel creation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+    if idempotency_key:
+        db.add(IdempotencyKey(key=idempotency_key, channel_name=payload.channel_name, channel_id=channel_id))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+    return CreateChannelResponse(channel_name=payload.channel_name, channel_id=channel_id)
+
 
 @router.get("/debug/token-info", response_model=TokenInfoResponse)
 async def debug_token_info():
     """Return basic information about the configured Slack token."""
     try:
-        info = token_info()
+        info = await token_info_async()
         return info
     except Exception as e:
         logger.error("Token info retrieval failed: %s", e)
@@ -45,21 +83,24 @@ async def test_modal_endpoint():
     try:
         # Generate a test trigger ID (this won't work with a fake trigger ID, but helps debug the code flow)
         test_trigger = "test_trigger_" + str(int(time.time()))
-        logger.info(f"Debug endpoint: Testing with trigger ID: {test_trigger}")
+        logger.info("Debug endpoint: Testing with trigger ID: %s", test_trigger)
         
         # Test token info first
-        token_response = token_info()
-        logger.info(f"Token info: {token_response}")
+        token_response = await token_info_async()
+        logger.info("Token info: %s", token_response)
         
         # The following will fail with a fake trigger ID, but helps diagnose permission issues:
         try:
-            open_channel_creation_modal(test_trigger)
+            await open_channel_creation_modal_async(test_trigger)
         except Exception as modal_error:
-            logger.info(f"Expected modal error (fake trigger ID): {str(modal_error)}")
+            logger.info("Expected modal error (fake trigger ID): %s", modal_error)
         
         # Show token permissions
-        auth_test = client.auth_test()
-        token_scopes = client.apps_permissions_info()
+        client = get_async_client()
+        auth_test = (await scheduler.call("auth.test", client.auth_test, priority=PRIORITY_INTERACTIVE)).data
+        token_scopes = await scheduler.call(
+            "apps.permissions.info", client.apps_permissions_info, priority=PRIORITY_INTERACTIVE
+        )
         
         return {
             "token_info": token_response,
@@ -68,41 +109,9 @@ async def test_modal_endpoint():
             "note": "Modal test will fail with fake trigger_id - this is expected. Check logs for more details."
         }
     except Exception as e:
-        logger.error(f"Debug endpoint error: {e}", exc_info=True)
+        logger.error("Debug endpoint error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-def verify_slack_signature(request: Request):
-    """Verify that the request is coming from Slack."""
-    if not SLACK_SIGNING_SECRET:
-        logger.warning("SLACK_SIGNING_SECRET not set, skipping verification")
-        return True
-        
-    # Get headers
-    slack_signature = request.headers.get("X-Slack-Signature", "")
-    slack_timestamp = request.headers.get("X-Slack-Request-Timestamp", "")
-    
-    # Check for replay attacks
-    if abs(time.time() - int(slack_timestamp)) > 60 * 5:
-        logger.warning("Timestamp too old, possible replay attack")
-        return False
-        
-    # Create signature base string
-    sig_basestring = f"v0:{slack_timestamp}:{request.body}"
-    
-    # Generate HMAC signature
-    my_signature = 'v0=' + hmac.new(
-        SLACK_SIGNING_SECRET.encode(),
-        sig_basestring.encode(),
-        hashlib.sha256
-    ).hexdigest()
-    
-    # Compare signatures
-    if not hmac.compare_digest(my_signature, slack_signature):
-        logger.warning("Signature verification failed")
-        return False
-        
-    return True
-
 @router.post("/slack/commands/create-channel", response_model=SlackCommandResponse)
 async def slash_create_channel(
     token: str = Form(...),
@@ -120,39 +129,34 @@ async def slash_create_channel(
 ):
     """Handle /create-channel slash command."""
     
-    logger.info(f"Received slash command: {command} from {user_name}")
-    logger.info(f"Request data - trigger_id: {trigger_id}, response_url: {response_url}")
-    
-    # Debug headers
-    headers = dict(request.headers.items()) if request else {}
-    logger.info(f"Request headers: {headers}")
+    logger.info("Received slash command %s from %s", command, user_name)
+    logger.debug("Request data - trigger_id: %s, response_url: %s", trigger_id, response_url)
     
-    # Verify Slack signature (commented out for initial testing)
-    # if not verify_slack_signature(request):
-    #     logger.error("Slack signature verification failed")
-    #     raise HTTPException(status_code=401, detail="Signature verification failed")
+    if request is not None and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Request headers: %s", dict(request.headers.items()))
     
+    # Slack signatures are verified by SlackSignatureMiddleware before routing
+
     try:
-        # Log before opening the modal
-        logger.info(f"Attempting to open modal with trigger_id: {trigger_id}")
-        
-        # Open a modal for channel creation
-        modal_response = open_channel_creation_modal(trigger_id)
-        logger.info(f"Modal open response: {modal_response}")
+        # Open a modal for channel creation, pre-filled with "/create-channel <name>"
+        prefill = normalize_channel_name(text) if text else None
+        modal_response = await open_channel_creation_modal_async(trigger_id, prefill, team_id=team_id)
+        logger.debug("Modal open response: %s", modal_response)
         
         return SlackCommandResponse(
             text="Opening channel creation form..."
         )
     except Exception as e:
-        logger.error(f"Error handling slash command: {e}", exc_info=True)
+        logger.error("Error handling slash command: %s", e, exc_info=True)
         # Return a message that will be visible to the user
         return SlackCommandResponse(
             text=f"Error: {str(e)}"
         )
 
 @router.post("/slack/interactions")
-async def slack_interactions(request: Request):
+async def slack_interactions(request: Request, background_tasks: BackgroundTasks):
     """Handle Slack interactive components like modals."""
+    started = time.perf_counter()
     try:
         # Parse form data
         form_data = await request.form()
@@ -163,51 +167,106 @@ async def slack_interactions(request: Request):
         
         # Handle different types of interactions
         if interaction.type == "view_submission" and interaction.view.callback_id == "channel_creation_modal":
-            return handle_channel_modal_submission(interaction)
+            response = accept_channel_modal_submission(interaction, background_tasks)
+            interaction_ack_seconds.observe(time.perf_counter() - started)
+            return response
             
         return {"text": "Received interaction"}
     except Exception as e:
-        logger.error(f"Error handling interaction: {e}")
+        logger.error("Error handling interaction: %s", e)
         return {"text": f"Error: {str(e)}"}
 
-def handle_channel_modal_submission(interaction):
-    """Handle submission of the channel creation modal."""
+def accept_channel_modal_submission(interaction, background_tasks: BackgroundTasks):
+    """Validate a channel creation modal submission and acknowledge it right away.
+
+    Slack gives us 3 seconds to answer, so only local checks run here. The
+    modal switches to a progress view and the channel is created afterwards by
+    ``create_channel_from_modal``, which updates the view with the result.
+    """
+    # Extract values from the submitted view
+    values = interaction.view.state.values
+
+    channel_name = values["channel_name_block"]["channel_name_input"]["value"] or ""
+    channel_type = values["channel_type_block"]["channel_type_select"]["selected_option"]["value"]
+    is_private = channel_type.lower() == "private"
+    team_id = interaction.team.id
+
+    problem = check_channel_name(channel_name, team_id)
+    if problem is not None:
+        return {
+            "response_action": "errors",
+            "errors": {
+                "channel_name_block": _channel_name_error_text(problem)
+            }
+        }
+
+    # Get selected users
+    selected_users = []
+    if "users_block" in values and "users_select" in values["users_block"]:
+        selected_users = values["users_block"]["users_select"].get("selected_users", [])
+
+    background_tasks.add_task(
+        create_channel_from_modal,
+        interaction.view.id,
+        interaction.response_url,
+        channel_name,
+        is_private,
+        selected_users,
+        team_id,
+    )
+    return Response(
+        content=templates.render("channel_progress_ack", channel_name=channel_name), media_type="application/json"
+    )
+
+async def create_channel_from_modal(
+    view_id: str,
+    response_url: Optional[str],
+    channel_name: str,
+    is_private: bool,
+    selected_users: list[str],
+    team_id: Optional[str] = None,
+):
+    """Create the channel for an acknowledged modal submission and report back to the user."""
     try:
-        # Extract values from the submitted view
-        values = interaction.view.state.values
-        
-        channel_name = values["channel_name_block"]["channel_name_input"]["value"]
-        channel_type = values["channel_type_block"]["channel_type_select"]["selected_option"]["value"]
-        is_private = channel_type.lower() == "private"
-        
         # Create the channel
-        channel_id = create_channel(channel_name, is_private)
-        
-        # Get selected users
-        selected_users = []
-        if "users_block" in values and "users_select" in values["users_block"]:
-            selected_users = values["users_block"]["users_select"].get("selected_users", [])
-        
+        channel_id = await create_channel_async(
+            channel_name, is_private, priority=PRIORITY_INTERACTIVE, team_id=team_id
+        )
+
         # Invite users if any were selected
+        not_invited = []
         if selected_users:
-            invite_users(channel_id, selected_users)
-        
-        # Send a confirmation message
-        user_id = interaction.user.id
+            invites = await invite_users_async(
+                channel_id, selected_users, priority=PRIORITY_INTERACTIVE, team_id=team_id
+            )
+            not_invited = [user for user, outcome in invites.items() if outcome not in INVITE_OK]
+
         channel_url = f"https://slack.com/app_redirect?channel={channel_id}"
-        
-        send_delayed_response(
-            interaction.response_url,
-            f"Channel <{channel_url}|#{channel_name}> has been created successfully!",
-            "ephemeral"
-        )
-        
-        return {"response_action": "clear"}
+        message = f"Channel <{channel_url}|#{channel_name}> has been created successfully!"
+        if not_invited:
+            message += " Could not invite " + ", ".join(f"<@{user}>" for user in not_invited) + "."
+    except ChannelNameError as e:
+        message = f":warning: Could not create *#{channel_name}*. {_channel_name_error_text(e)}"
     except Exception as e:
-        logger.error(f"Error creating channel from modal: {e}")
-        return {
-            "response_action": "errors",
-            "errors": {
-                "channel_name_block": f"Error: {str(e)}"
-            }
-        }
+        logger.error("Error creating channel from modal: %s", e)
+        message = f":warning: Could not create *#{channel_name}*: {str(e)}"
+
+    try:
+        await update_view_async(view_id, channel_result_view(message), team_id=team_id)
+    except Exception as e:
+        logger.error("Error updating modal %s: %s", view_id, e)
+    if response_url:
+        await send_delayed_response_async(response_url, message, "ephemeral")
+
+def _channel_name_error_text(error: ChannelNameError) -> str:
+    messages = {
+        "name_taken": "That channel name is already taken.",
+        "invalid_name_maxlength": "Channel names must be 80 characters or less.",
+        "invalid_name_required": "Please enter a channel name.",
+    }
+    text = messages.get(
+        error.error, "Use only lowercase letters, numbers, hyphens and underscores."
+    )
+    if error.suggestions:
+        text += " Try: " + ", ".join(error.suggestions)
+    return text
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import List, Optional, Literal
-from pydantic import BaseModel
+from typing import Dict, List, Optional, Literal
+from pydantic import BaseModel, field_validator
 
 class ChannelRequestCreate(BaseModel):
     channel_name: str
@@ -9,23 +9,101 @@ class ChannelRequestCreate(BaseModel):
     visibility: Literal['public', 'private']
     users_to_add: Optional[List[str]] = None
     form_submission_id: Optional[str] = None
+    # Slack workspace to create the channel in; the default workspace when omitted
+    team_id: Optional[str] = None
+
+    @field_validator('form_submission_id', mode='before')
+    @classmethod
+    def blank_submission_id_is_none(cls, value):
+        # A blank ID would collide with every other blank one on the unique index
+        if isinstance(value, str) and not value.strip():
+            return None
+        return value
+
+class InviteResult(BaseModel):
+    user_id: Optional[str] = None
+    status: Literal['invited', 'already_in_channel', 'failed']
+    error: Optional[str] = None
 
 class ChannelRequestResponse(BaseModel):
     id: int
     channel_name: str
     channel_id: Optional[str]
-    status: Literal['pending', 'created', 'failed']
+    status: Literal['pending', 'created', 'failed', 'dead_letter']
     created_at: datetime
+    invite_results: Optional[Dict[str, InviteResult]] = None
 
     class Config:
         orm_mode = True
 
 
+class ChannelRequestDetail(ChannelRequestResponse):
+    requester_email: str
+    requester_name: Optional[str] = None
+    visibility: Literal['public', 'private']
+    users_to_add: Optional[List[str]] = None
+    error_message: Optional[str] = None
+    form_submission_id: Optional[str] = None
+    batch_id: Optional[str] = None
+    team_id: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    attempts: int = 0
+    next_attempt_at: Optional[datetime] = None
+
+
+class ChannelRequestPage(BaseModel):
+    items: List[ChannelRequestDetail]
+    next_cursor: Optional[str] = None
+
+
+class BatchSubmissionResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: Literal['pending', 'created', 'failed', 'dead_letter', 'rejected']
+    duplicate: bool = False
+    error: Optional[str] = None
+    suggestions: List[str] = []
+
+
+class BatchSubmissionResponse(BaseModel):
+    accepted: int
+    duplicates: int
+    rejected: int
+    items: List[BatchSubmissionResult]
+
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkImportResponse(BaseModel):
+    batch_id: str
+    accepted: int
+    rejected: int
+    duplicates: int = 0
+    errors: List[BulkImportError] = []
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    source: Optional[str] = None
+    total: int
+    rejected: int
+    pending: int
+    created: int
+    failed: int
+    dead_letter: int = 0
+    complete: bool
+    created_at: datetime
+
+
 class CreateChannelRequest(BaseModel):
     channel_name: str
     channel_type: Literal['Public', 'Private']
     who_for: Optional[str] = None
     submitted_by: Optional[str] = None
+    team_id: Optional[str] = None
 
 
 class CreateChannelResponse(BaseModel):
@@ -0,0 +1,275 @@
+import csv
+import json
+import logging
+import re
+import uuid
+from typing import AsyncIterator, Iterable, Optional
+
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.archived_submission import ArchivedSubmission
+from app.models.channel_batch import ChannelBatch
+from app.models.channel_request import ChannelRequest
+from app.schemas.channel import ChannelRequestCreate
+from app.services.channel_names import channel_index, validate_channel_name
+
+BULK_INSERT_CHUNK_SIZE = settings.bulk_insert_chunk_size
+MAX_REPORTED_ERRORS = 100
+
+CSV_FORMAT = "csv"
+JSONL_FORMAT = "jsonl"
+
+logger = logging.getLogger(__name__)
+
+
+def format_for_content_type(content_type: Optional[str]) -> str:
+    if content_type and "csv" in content_type:
+        return CSV_FORMAT
+    return JSONL_FORMAT
+
+
+def format_for_filename(filename: str) -> str:
+    return CSV_FORMAT if filename.lower().endswith(".csv") else JSONL_FORMAT
+
+
+class ChannelSpecParser:
+    """Parse CSV or JSON-lines channel specs one line at a time.
+
+    CSV input needs a header row naming the ``ChannelRequestCreate`` fields;
+    ``users_to_add`` may hold several emails separated by commas, semicolons or spaces.
+    Quoted CSV values cannot span lines.
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.header: Optional[list[str]] = None
+
+    def parse_line(self, line: str) -> Optional[ChannelRequestCreate]:
+        """Return the spec on this line, or ``None`` for blank and header lines.
+
+        Raises ``ValueError`` for a malformed row.
+        """
+        line = line.strip()
+        if not line:
+            return None
+        if self.fmt == JSONL_FORMAT:
+            return ChannelRequestCreate(**json.loads(line))
+
+        values = next(csv.reader([line]))
+        if self.header is None:
+            self.header = [name.strip() for name in values]
+            return None
+        row = {name: value.strip() for name, value in zip(self.header, values) if value.strip()}
+        if "users_to_add" in row:
+            row["users_to_add"] = [email for email in re.split(r"[,;\s]+", row["users_to_add"]) if email]
+        if "visibility" in row:
+            row["visibility"] = row["visibility"].lower()
+        return ChannelRequestCreate(**row)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed request body into decoded lines without buffering it whole."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig")
+    if buffer:
+        yield buffer.decode("utf-8-sig")
+
+
+def create_batch(source: Optional[str] = None) -> str:
+    with SessionLocal() as db:
+        batch = ChannelBatch(id=uuid.uuid4().hex, source=source)
+        db.add(batch)
+        db.commit()
+        return batch.id
+
+
+def _drop_duplicate_submissions(db, specs: list[tuple[int, ChannelRequestCreate]]) -> list[tuple[int, ChannelRequestCreate]]:
+    submission_ids = {spec.form_submission_id for _, spec in specs if spec.form_submission_id}
+    if not submission_ids:
+        return specs
+    seen = {
+        row.form_submission_id
+        for row in db.query(ChannelRequest.form_submission_id).filter(
+            ChannelRequest.form_submission_id.in_(submission_ids)
+        ).union_all(
+            # Requests past their retention period
+            db.query(ArchivedSubmission.form_submission_id).filter(
+                ArchivedSubmission.form_submission_id.in_(submission_ids)
+            )
+        )
+    }
+    unique = []
+    for line_no, spec in specs:
+        if spec.form_submission_id:
+            if spec.form_submission_id in seen:
+                continue
+            seen.add(spec.form_submission_id)
+        unique.append((line_no, spec))
+    return unique
+
+
+def _channel_name_error(spec: ChannelRequestCreate) -> Optional[str]:
+    # Other workspaces' indexes live on the event loop; only Slack's naming rules are checked for them
+    if not spec.team_id:
+        return channel_index.check(spec.channel_name)
+    return validate_channel_name(spec.channel_name)
+
+
+def insert_specs(batch_id: str, specs: list[tuple[int, ChannelRequestCreate]]) -> tuple[int, int, list[dict]]:
+    """Insert one chunk of ``(line number, spec)`` pairs as pending requests in a single transaction.
+
+    Specs whose ``form_submission_id`` is already stored are skipped before
+    their channel names are checked, since a re-imported row's channel is
+    already taken by itself. Returns ``(inserted, duplicates, errors)``, with
+    an error per rejected name. A chunk that collides with submissions stored
+    concurrently is deduplicated again and retried once.
+    """
+    if not specs:
+        return 0, 0, []
+    with SessionLocal() as db:
+        for attempt in (1, 2):
+            unique = _drop_duplicate_submissions(db, specs)
+            errors = []
+            rows = []
+            for line_no, spec in unique:
+                name_error = _channel_name_error(spec)
+                if name_error is not None:
+                    errors.append({"line": line_no, "error": f"{name_error}: {spec.channel_name}"})
+                    continue
+                rows.append({
+                    "channel_name": spec.channel_name,
+                    "requester_email": spec.requester_email,
+                    "requester_name": spec.requester_name,
+                    "visibility": spec.visibility,
+                    "users_to_add": spec.users_to_add,
+                    "form_submission_id": spec.form_submission_id,
+                    "batch_id": batch_id,
+                    "team_id": spec.team_id,
+                    "status": "pending",
+                })
+            if not rows:
+                break
+            try:
+                db.execute(insert(ChannelRequest), rows)
+                db.query(ChannelBatch).filter(ChannelBatch.id == batch_id).update(
+                    {ChannelBatch.total: ChannelBatch.total + len(rows)}
+                )
+                db.commit()
+                break
+            except IntegrityError:
+                # A concurrent webhook or import stored some of these first; look them up again
+                db.rollback()
+                if attempt == 2:
+                    raise
+    return len(rows), len(specs) - len(unique), errors
+
+
+def record_rejected(batch_id: str, rejected: int):
+    if not rejected:
+        return
+    with SessionLocal() as db:
+        db.query(ChannelBatch).filter(ChannelBatch.id == batch_id).update({ChannelBatch.rejected: rejected})
+        db.commit()
+
+
+class BatchImport:
+    """Accumulates parsed specs into insert-sized chunks and tallies per-line errors."""
+
+    def __init__(self, batch_id: str, fmt: str, chunk_size: int = BULK_INSERT_CHUNK_SIZE):
+        self.batch_id = batch_id
+        self.parser = ChannelSpecParser(fmt)
+        self.chunk_size = chunk_size
+        self.accepted = 0
+        self.rejected = 0
+        self.duplicates = 0
+        self.errors: list[dict] = []
+        self._line_no = 0
+        self._chunk: list[tuple[int, ChannelRequestCreate]] = []
+
+    def add_line(self, line: str) -> Optional[list[tuple[int, ChannelRequestCreate]]]:
+        """Parse one line; returns a full chunk when one is ready to insert.
+
+        Channel names are checked by ``insert_specs``, once duplicates are dropped.
+        """
+        self._line_no += 1
+        try:
+            spec = self.parser.parse_line(line)
+        except ValueError as e:
+            self._reject({"line": self._line_no, "error": str(e)})
+            return None
+        if spec is not None:
+            self._chunk.append((self._line_no, spec))
+        if len(self._chunk) >= self.chunk_size:
+            return self.take_chunk()
+        return None
+
+    def _reject(self, error: dict):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+    def inserted(self, counts: tuple[int, int, list[dict]]):
+        """Tally the ``(inserted, duplicates, errors)`` result of ``insert_specs``."""
+        self.accepted += counts[0]
+        self.duplicates += counts[1]
+        for error in counts[2]:
+            self._reject(error)
+
+    def take_chunk(self) -> list[tuple[int, ChannelRequestCreate]]:
+        chunk, self._chunk = self._chunk, []
+        return chunk
+
+    def result(self) -> dict:
+        return {
+            "batch_id": self.batch_id,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "duplicates": self.duplicates,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+        }
+
+
+def import_lines(lines: Iterable[str], fmt: str, source: Optional[str] = None) -> dict:
+    """Synchronous import used by the CLI. Returns the same shape as the bulk endpoint."""
+    importer = BatchImport(create_batch(source), fmt)
+    for line in lines:
+        chunk = importer.add_line(line)
+        if chunk:
+            importer.inserted(insert_specs(importer.batch_id, chunk))
+    importer.inserted(insert_specs(importer.batch_id, importer.take_chunk()))
+    record_rejected(importer.batch_id, importer.rejected)
+    logger.info("Imported batch %s: %s accepted, %s rejected", importer.batch_id, importer.accepted, importer.rejected)
+    return importer.result()
+
+
+def batch_status(batch_id: str) -> Optional[dict]:
+    with SessionLocal() as db:
+        batch = db.get(ChannelBatch, batch_id)
+        if batch is None:
+            return None
+        counts = dict(
+            db.query(ChannelRequest.status, func.count(ChannelRequest.id))
+            .filter(ChannelRequest.batch_id == batch_id)
+            .group_by(ChannelRequest.status)
+            .all()
+        )
+        pending = counts.get("pending", 0)
+        return {
+            "batch_id": batch.id,
+            "source": batch.source,
+            "total": batch.total,
+            "rejected": batch.rejected,
+            "pending": pending,
+            "created": counts.get("created", 0),
+            "failed": counts.get("failed", 0),
+            "dead_letter": counts.get("dead_letter", 0),
+            "complete": pending == 0,
+            "created_at": batch.created_at,
+        }
@@ -0,0 +1,81 @@
+import re
+from typing import Optional
+
+# Slack's rules for conversations.create names
+MAX_CHANNEL_NAME_LENGTH = 80
+_VALID_NAME = re.compile(r"^[\w-]+$")
+_INVALID_CHARS = re.compile(r"[^\w-]+")
+_PUNCTUATION_ONLY = re.compile(r"^[-_]+$")
+_REPEATED_HYPHENS = re.compile(r"-{2,}")
+
+
+def validate_channel_name(name: str) -> Optional[str]:
+    """Return the Slack error code ``conversations.create`` would give ``name``, or ``None`` if it is valid."""
+    if not name:
+        return "invalid_name_required"
+    if len(name) > MAX_CHANNEL_NAME_LENGTH:
+        return "invalid_name_maxlength"
+    if name != name.lower() or not _VALID_NAME.match(name):
+        return "invalid_name_specials"
+    if _PUNCTUATION_ONLY.match(name):
+        return "invalid_name_punctuation"
+    return None
+
+
+def normalize_channel_name(name: str) -> str:
+    """Best-effort conversion of free text into a valid channel name."""
+    name = _INVALID_CHARS.sub("-", name.strip().lower())
+    name = _REPEATED_HYPHENS.sub("-", name).strip("-")
+    return name[:MAX_CHANNEL_NAME_LENGTH]
+
+
+class ChannelNameIndex:
+    """Local set of channel names already in use in the workspace.
+
+    Loaded from ``conversations.list`` and kept current by our own creates, so
+    taken names are caught without a Slack round-trip. Private channels the bot
+    is not a member of are invisible to it and can still collide.
+    """
+
+    def __init__(self):
+        self._names: set[str] = set()
+        self.loaded = False
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name: str):
+        self._names.add(name.lower())
+
+    def replace(self, names: set[str]):
+        # Keep names added by our own creates while the sweep was running
+        self._names = {name.lower() for name in names} | self._names
+        self.loaded = True
+
+    def check(self, name: str) -> Optional[str]:
+        """Return ``name_taken`` or a naming error code for ``name``, or ``None`` if it looks free."""
+        error = validate_channel_name(name)
+        if error is None and name in self:
+            return "name_taken"
+        return error
+
+    def suggest(self, name: str, count: int = 3) -> list[str]:
+        """Suggest free, valid alternatives to ``name``."""
+        base = normalize_channel_name(name) or "channel"
+        suggestions = []
+        if base != name and self.check(base) is None:
+            suggestions.append(base)
+        suffix = 2
+        while len(suggestions) < count:
+            tail = f"-{suffix}"
+            candidate = base[:MAX_CHANNEL_NAME_LENGTH - len(tail)] + tail
+            if candidate not in self:
+                suggestions.append(candidate)
+            suffix += 1
+        return suggestions
+
+
+channel_index = ChannelNameIndex()
@@ -0,0 +1,314 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal, SessionLocal
+from app.logging_config import log_context
+from app.models.channel_request import ChannelRequest
+from app.services.metrics import Gauge
+from app.services.status_writer import status_writer
+from app.services.retries import CHANNEL_MAX_ATTEMPTS, error_code, is_retryable, next_attempt_at
+from app.services.leases import CHANNEL_LEASE_SECONDS, WORKER_ID, claim_requests, release_leases, renew_leases
+from app.services.slack_service import (
+    INVITE_OK,
+    ChannelNameError,
+    create_channel_async,
+    find_own_channel_async,
+    invite_users_async,
+    lookup_user_async,
+)
+
+CHANNEL_WORKERS = settings.channel_workers
+CHANNEL_QUEUE_POLL_INTERVAL = settings.channel_queue_poll_interval
+
+logger = logging.getLogger(__name__)
+
+
+# Scrape-time gauge callback; /metrics renders in the threadpool, so this stays sync
+def _count_by_status() -> dict:
+    with SessionLocal() as db:
+        rows = db.query(ChannelRequest.status, func.count(ChannelRequest.id)).group_by(ChannelRequest.status)
+        return {(status,): count for status, count in rows}
+
+
+async def _load_request(request_id: int) -> Optional[ChannelRequest]:
+    async with AsyncSessionLocal() as db:
+        return await db.get(ChannelRequest, request_id)
+
+
+# Written straight through rather than via the status writer: once the channel
+# exists the ID must be durable, or a restart would try to create it again
+async def _save_channel_id(request_id: int, channel_id: str) -> bool:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(ChannelRequest)
+            .where(ChannelRequest.id == request_id, ChannelRequest.lease_owner == WORKER_ID)
+            .values(channel_id=channel_id)
+        )
+        await db.commit()
+    return result.rowcount == 1
+
+
+async def _create_channel(req: ChannelRequest) -> str:
+    try:
+        return await create_channel_async(req.channel_name, req.visibility == 'private', team_id=req.team_id)
+    except ChannelNameError as e:
+        if e.error != "name_taken":
+            raise
+        # An earlier attempt may have created the channel and then failed or crashed
+        # before saving its ID. A crash leaves attempts unchanged, so the channel's
+        # creator and creation time decide rather than the attempt count.
+        channel_id = await find_own_channel_async(req.channel_name, req.created_at, team_id=req.team_id)
+        if channel_id is None:
+            raise
+        logger.info("Channel request %s: using %s, created by an earlier attempt", req.id, channel_id)
+        return channel_id
+
+
+async def _invite_by_email(channel_id: str, emails: list[str], team_id: Optional[str] = None) -> dict[str, dict]:
+    """Look up and invite ``emails``; returns ``{email: {"user_id", "status", "error"}}``.
+
+    An email that cannot be resolved or invited is recorded on its own entry
+    instead of failing the request.
+    """
+    emails = list(dict.fromkeys(emails))
+    lookups = await asyncio.gather(
+        *(lookup_user_async(email, team_id=team_id) for email in emails), return_exceptions=True
+    )
+    results = {}
+    found = {}
+    for email, user_id in zip(emails, lookups):
+        if isinstance(user_id, Exception):
+            results[email] = {"user_id": None, "status": "failed", "error": error_code(user_id)}
+        else:
+            found[email] = user_id
+    invites = await invite_users_async(channel_id, list(found.values()), team_id=team_id) if found else {}
+    for email, user_id in found.items():
+        outcome = invites[user_id]
+        if outcome in INVITE_OK:
+            results[email] = {"user_id": user_id, "status": outcome, "error": None}
+        else:
+            results[email] = {"user_id": user_id, "status": "failed", "error": outcome}
+    return results
+
+
+_NO_LEASE = {"lease_owner": None, "lease_expires_at": None}
+
+
+def _needs_invite(result: Optional[dict]) -> bool:
+    # Not tried yet, or failed in a way that may work next time
+    return result is None or (result["status"] == "failed" and is_retryable(result["error"]))
+
+
+def _record_failure(req: ChannelRequest, attempts: int, error: Exception) -> asyncio.Future:
+    code = error_code(error)
+    if not is_retryable(code):
+        status = 'failed'
+    elif attempts >= CHANNEL_MAX_ATTEMPTS:
+        status = 'dead_letter'
+    else:
+        retry_at = next_attempt_at(attempts)
+        logger.warning("Channel request %s failed with %s, retrying at %s (attempt %s)", req.id, code, retry_at, attempts)
+        return status_writer.record(
+            req.id, attempts=attempts, next_attempt_at=retry_at, error_message=str(error), **_NO_LEASE
+        )
+    logger.error("Channel request %s %s: %s", req.id, "dead-lettered" if status == 'dead_letter' else "failed", error)
+    return status_writer.record(
+        req.id,
+        status=status,
+        attempts=attempts,
+        next_attempt_at=None,
+        error_message=str(error),
+        completed_at=datetime.utcnow(),
+        **_NO_LEASE,
+    )
+
+
+async def process_channel_request(request_id: int) -> Optional[asyncio.Future]:
+    """Run the create -> lookup -> invite workflow for one stored request.
+
+    Each step is skipped when an earlier attempt already finished it: the
+    channel ID is persisted as soon as the channel exists (or, if that write
+    never happened, the channel is found again by name), and users whose
+    ``invite_results`` entry shows them invited (or failed for good) are not
+    invited again. Per-user outcomes are stored in ``invite_results``; users
+    that could not be invited leave the request ``created`` with a summary in
+    ``error_message``. Retryable failures, of the request or of single
+    invites, send it back to ``pending`` until ``next_attempt_at`` (see
+    ``app.services.retries``). The final status goes through the status
+    writer; the returned future resolves once it has been committed.
+    """
+    req = await _load_request(request_id)
+    if req is None or req.status != 'pending' or req.lease_owner != WORKER_ID:
+        return None
+
+    attempts = req.attempts + 1
+    invite_results = dict(req.invite_results or {})
+    try:
+        channel_id = req.channel_id
+        if channel_id is None:
+            channel_id = await _create_channel(req)
+            if not await _save_channel_id(request_id, channel_id):
+                logger.warning("Lost the lease on channel request %s after creating %s", request_id, channel_id)
+                return None
+        emails = [email for email in req.users_to_add or [] if _needs_invite(invite_results.get(email))]
+        if emails:
+            invite_results.update(await _invite_by_email(channel_id, emails, req.team_id))
+    except Exception as e:
+        return _record_failure(req, attempts, e)
+
+    error_message = None
+    not_invited = [email for email, result in invite_results.items() if result["status"] == "failed"]
+    if not_invited:
+        error_message = f"{len(not_invited)} of {len(invite_results)} users could not be invited: {', '.join(not_invited)}"
+        if attempts < CHANNEL_MAX_ATTEMPTS and any(_needs_invite(invite_results[email]) for email in not_invited):
+            retry_at = next_attempt_at(attempts)
+            logger.warning("Channel request %s: %s; retrying at %s", request_id, error_message, retry_at)
+            return status_writer.record(
+                request_id,
+                attempts=attempts,
+                next_attempt_at=retry_at,
+                error_message=error_message,
+                invite_results=invite_results,
+                **_NO_LEASE,
+            )
+        logger.warning("Channel request %s: %s", request_id, error_message)
+
+    logger.info("Channel request %s completed", request_id)
+    return status_writer.record(
+        request_id,
+        status='created',
+        attempts=attempts,
+        next_attempt_at=None,
+        error_message=error_message,
+        invite_results=invite_results or None,
+        completed_at=datetime.utcnow(),
+        **_NO_LEASE,
+    )
+
+
+class ChannelRequestQueue:
+    """In-process worker pool draining pending rows of ``channel_requests``.
+
+    The table itself is the durable queue: rows stay ``pending`` until a worker
+    finishes them. Rows are leased before they are worked on (see
+    ``app.services.leases``), so any number of processes can drain the same
+    table, and rows left behind by a crashed process are reclaimed once their
+    lease expires.
+    """
+
+    def __init__(
+        self,
+        workers: int = CHANNEL_WORKERS,
+        poll_interval: float = CHANNEL_QUEUE_POLL_INTERVAL,
+        lease_seconds: float = CHANNEL_LEASE_SECONDS,
+    ):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._claimed: set[int] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.workers * 2)
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._tasks.append(asyncio.create_task(self._feed()))
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        for _ in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._work()))
+        logger.info("Started channel request queue with %s workers as %s", self.workers, WORKER_ID)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Hand unfinished rows back so another process can pick them up right away
+        try:
+            await release_leases(set(self._claimed))
+        except Exception as e:
+            logger.error("Failed to release channel request leases: %s", e)
+        self._claimed.clear()
+
+    def notify(self):
+        """Wake the feeder so a freshly stored request is picked up immediately.
+
+        Safe to call from threadpool handlers as well as from the event loop.
+        """
+        if self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _feed(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                free = self._queue.maxsize - self._queue.qsize()
+                ids = await claim_requests(free, lease_seconds=self.lease_seconds) if free else []
+                for request_id in ids:
+                    self._claimed.add(request_id)
+                    await self._queue.put(request_id)
+            except Exception as e:
+                logger.error("Failed to fetch pending channel requests: %s", e)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await renew_leases(set(self._claimed), lease_seconds=self.lease_seconds)
+            except Exception as e:
+                logger.error("Failed to renew channel request leases: %s", e)
+
+    async def _work(self):
+        while True:
+            request_id = await self._queue.get()
+            written = None
+            try:
+                # Slack calls and status writes logged from here on carry the request's ID
+                with log_context(channel_request_id=request_id):
+                    written = await process_channel_request(request_id)
+            except Exception as e:
+                logger.error("Worker failed on channel request %s: %s", request_id, e)
+            finally:
+                self._queue.task_done()
+                if written is None:
+                    self._release(request_id)
+                else:
+                    # Keep the row claimed until its final status is committed,
+                    # otherwise the feeder would still see it as pending
+                    written.add_done_callback(lambda future, request_id=request_id: self._written(request_id, future))
+
+    def _written(self, request_id: int, future: asyncio.Future):
+        # A failed write was given up on (and logged) by the status writer; once
+        # released, the row's lease lapses and another worker reclaims it
+        if not future.cancelled():
+            future.exception()
+        self._release(request_id)
+
+    def _release(self, request_id: int):
+        self._claimed.discard(request_id)
+        # A slot has freed up; let the feeder top the queue back up
+        self._wakeup.set()
+
+
+channel_queue = ChannelRequestQueue()
+
+Gauge("channel_requests", "Channel requests stored, by status", ("status",), callback=_count_by_status)
+Gauge(
+    "channel_queue_claimed",
+    "Channel requests queued or in flight on this process's workers",
+    callback=lambda: len(channel_queue._claimed),
+)
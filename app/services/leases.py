@@ -0,0 +1,103 @@
+"""Lease-based claiming of ``channel_requests`` rows across processes and hosts.
+
+A worker owns a pending row while ``lease_owner`` is its ``WORKER_ID`` and
+``lease_expires_at`` is in the future. Owners renew their leases with
+heartbeats; rows whose lease has expired (e.g. the owner crashed) can be
+claimed by anyone. Writes made on behalf of a claimed row are fenced on
+``lease_owner`` so a worker that lost its lease cannot overwrite the new owner.
+"""
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select, update
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.channel_request import ChannelRequest
+
+CHANNEL_LEASE_SECONDS = settings.channel_lease_seconds
+
+# Unique per process, so several uvicorn workers on one host never share leases
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Backends that support SELECT ... FOR UPDATE SKIP LOCKED
+SKIP_LOCKED_BACKENDS = {"postgresql", "mysql", "mariadb", "oracle"}
+
+
+def _claimable(now: datetime):
+    return and_(
+        ChannelRequest.status == 'pending',
+        or_(ChannelRequest.lease_owner.is_(None), ChannelRequest.lease_expires_at < now),
+        # Requests waiting out a retry backoff are left alone until they are due
+        or_(ChannelRequest.next_attempt_at.is_(None), ChannelRequest.next_attempt_at <= now),
+    )
+
+
+async def claim_requests(limit: int, owner: str = WORKER_ID, lease_seconds: float = CHANNEL_LEASE_SECONDS) -> list[int]:
+    """Atomically lease up to ``limit`` claimable rows to ``owner`` and return their IDs."""
+    if limit <= 0:
+        return []
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=lease_seconds)
+    candidates = select(ChannelRequest.id).where(_claimable(now)).order_by(ChannelRequest.id).limit(limit)
+
+    async with AsyncSessionLocal() as db:
+        if db.bind.dialect.name in SKIP_LOCKED_BACKENDS:
+            # Rows locked by a concurrent claimer are skipped rather than waited on
+            ids = list((await db.execute(candidates.with_for_update(skip_locked=True))).scalars())
+            if ids:
+                await db.execute(
+                    update(ChannelRequest)
+                    .where(ChannelRequest.id.in_(ids))
+                    .values(lease_owner=owner, lease_expires_at=expires_at)
+                )
+        else:
+            # Compare-and-set in one statement: the candidate subquery runs inside
+            # the writing transaction and the UPDATE re-checks claimability, so
+            # concurrent claimers never take the same row and a loser moves on
+            # to the next free rows. Then read back what we won.
+            await db.execute(
+                update(ChannelRequest)
+                .where(ChannelRequest.id.in_(candidates), _claimable(now))
+                .values(lease_owner=owner, lease_expires_at=expires_at)
+                .execution_options(synchronize_session=False)
+            )
+            won = await db.execute(
+                select(ChannelRequest.id)
+                .where(ChannelRequest.lease_owner == owner, ChannelRequest.lease_expires_at == expires_at)
+                .order_by(ChannelRequest.id)
+            )
+            ids = list(won.scalars())
+        await db.commit()
+    return ids
+
+
+async def renew_leases(ids: set[int], owner: str = WORKER_ID, lease_seconds: float = CHANNEL_LEASE_SECONDS) -> int:
+    """Heartbeat: extend the leases ``owner`` still holds. Returns how many were renewed."""
+    if not ids:
+        return 0
+    expires_at = datetime.utcnow() + timedelta(seconds=lease_seconds)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(ChannelRequest)
+            .where(ChannelRequest.id.in_(ids), ChannelRequest.lease_owner == owner)
+            .values(lease_expires_at=expires_at)
+        )
+        await db.commit()
+    return result.rowcount
+
+
+async def release_leases(ids: set[int], owner: str = WORKER_ID):
+    """Give back leases on rows that were claimed but not processed, e.g. on shutdown."""
+    if not ids:
+        return
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ChannelRequest)
+            .where(ChannelRequest.id.in_(ids), ChannelRequest.lease_owner == owner)
+            .values(lease_owner=None, lease_expires_at=None)
+        )
+        await db.commit()
+
@@ -0,0 +1,259 @@
+"""In-process metrics with Prometheus text exposition.
+
+Recording is a dict lookup and a few additions under a lock, so it stays on
+in production. Gauges that are expensive to keep current (like row counts)
+take a callback instead and are only evaluated when ``/metrics`` is scraped.
+"""
+import bisect
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from sqlalchemy import event
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 3.0, 5.0, 10.0)
+
+logger = logging.getLogger(__name__)
+
+REGISTRY: list = []
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        # Metrics without labels record on a single implicit child
+        return self.labels()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric):
+    """Gauge read from a callback at scrape time.
+
+    The callback returns a number, or for labelled gauges a dict mapping
+    label-value tuples to numbers.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), callback: Optional[Callable] = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set_function(self, callback: Callable):
+        self.callback = callback
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        if self.callback is None:
+            return lines
+        try:
+            result = self.callback()
+        except Exception as e:
+            logger.error("Failed to collect gauge %s: %s", self.name, e)
+            return lines
+        if not isinstance(result, dict):
+            result = {(): result}
+        for values, value in result.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class _HistogramChild:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram, cheap enough to observe on every request."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    @property
+    def count(self) -> int:
+        return sum(child.count for child in self._children.values())
+
+    @property
+    def sum(self) -> float:
+        return sum(child.sum for child in self._children.values())
+
+    def _render_child(self, values, child):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def instrument_sessions(session_factory):
+    """Time transactions and commits of every session made by ``session_factory``."""
+    @event.listens_for(session_factory, "after_begin")
+    def _after_begin(session, transaction, connection):
+        session.info.setdefault("transaction_started", time.perf_counter())
+
+    @event.listens_for(session_factory, "before_commit")
+    def _before_commit(session):
+        session.info["commit_started"] = time.perf_counter()
+
+    @event.listens_for(session_factory, "after_commit")
+    def _after_commit(session):
+        started = session.info.pop("commit_started", None)
+        if started is not None:
+            db_commit_seconds.observe(time.perf_counter() - started)
+
+    @event.listens_for(session_factory, "after_transaction_end")
+    def _after_transaction_end(session, transaction):
+        if transaction.parent is None:
+            started = session.info.pop("transaction_started", None)
+            if started is not None:
+                db_transaction_seconds.observe(time.perf_counter() - started)
+
+
+interaction_ack_seconds = Histogram(
+    "slack_interaction_ack_seconds",
+    "Time from receiving a Slack interaction to acknowledging it",
+)
+slack_api_request_seconds = Histogram(
+    "slack_api_request_seconds",
+    "Latency of Slack Web API calls, excluding time queued in the rate scheduler",
+    ("method",),
+)
+slack_api_queue_seconds = Histogram(
+    "slack_api_queue_seconds",
+    "Time Slack Web API calls waited in the rate scheduler",
+    ("method",),
+)
+slack_api_ratelimited_total = Counter(
+    "slack_api_ratelimited_total",
+    "Slack Web API calls answered with 429",
+    ("method",),
+)
+slack_api_errors_total = Counter(
+    "slack_api_errors_total",
+    "Slack Web API calls that failed, by Slack error code",
+    ("method", "error"),
+)
+slack_signature_rejected_total = Counter(
+    "slack_signature_rejected_total",
+    "Requests to Slack endpoints rejected by signature verification, by reason",
+    ("reason",),
+)
+channel_requests_archived_total = Counter(
+    "channel_requests_archived_total",
+    "Completed channel requests moved out of channel_requests by retention, by destination",
+    ("archive",),
+)
+log_records_dropped_total = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full, by level",
+    ("level",),
+)
+db_transaction_seconds = Histogram(
+    "db_transaction_seconds",
+    "Duration of database transactions from first statement to commit or rollback",
+)
+db_commit_seconds = Histogram(
+    "db_commit_seconds",
+    "Duration of database commits",
+)
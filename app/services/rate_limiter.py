@@ -0,0 +1,178 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Optional
+
+from slack_sdk.errors import SlackApiError
+
+from app.config import settings
+from app.services.metrics import (
+    slack_api_errors_total,
+    slack_api_queue_seconds,
+    slack_api_ratelimited_total,
+    slack_api_request_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+# Slack's published tiers as (calls per minute, burst size)
+TIER_1 = (1, 1)
+TIER_2 = (20, 5)
+TIER_3 = (50, 10)
+TIER_4 = (100, 20)
+
+METHOD_TIERS = {
+    "conversations.create": TIER_2,
+    "conversations.list": TIER_2,
+    "conversations.invite": TIER_3,
+    "users.lookupByEmail": TIER_3,
+    "users.list": TIER_2,
+    "views.open": TIER_4,
+    "views.update": TIER_4,
+    "views.push": TIER_4,
+    "auth.test": TIER_4,
+    "apps.permissions.info": TIER_2,
+}
+DEFAULT_TIER = TIER_3
+
+SLACK_RATE_LIMIT_SCALE = settings.slack_rate_limit_scale
+SLACK_RATE_LIMIT_MAX_RETRIES = settings.slack_rate_limit_max_retries
+
+
+class TokenBucket:
+    """Token bucket whose waiters are released in priority order.
+
+    A 429 ``Retry-After`` blocks the whole bucket, so calls that are already
+    queued wait for the window instead of hitting Slack and failing again.
+    """
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self):
+        return len(self._waiters)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, priority: int = PRIORITY_BULK):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self._dispatch()
+        await future
+
+    def block_for(self, seconds: float):
+        """Stop handing out tokens for ``seconds`` (Slack's Retry-After)."""
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = now
+        self._schedule(self.blocked_until - now)
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    def _dispatch(self):
+        self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                # Caller was cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            if now < self.blocked_until:
+                self._schedule(self.blocked_until - now)
+                return
+            if self.tokens < 1:
+                self._schedule((1 - self.tokens) / self.rate)
+                return
+            heapq.heappop(self._waiters)
+            self.tokens -= 1
+            future.set_result(None)
+
+
+class SlackRateScheduler:
+    """Central gate for Slack Web API calls.
+
+    Every call acquires a token from its method's bucket first. Rate-limited
+    calls are re-queued after ``Retry-After`` rather than surfaced as errors.
+    """
+
+    def __init__(self, scale: float = SLACK_RATE_LIMIT_SCALE, max_retries: int = SLACK_RATE_LIMIT_MAX_RETRIES):
+        self.scale = scale
+        self.max_retries = max_retries
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, method: str) -> TokenBucket:
+        bucket = self._buckets.get(method)
+        if bucket is None:
+            per_minute, burst = METHOD_TIERS.get(method, DEFAULT_TIER)
+            bucket = TokenBucket(per_minute * self.scale, max(1, int(burst * self.scale)))
+            self._buckets[method] = bucket
+        return bucket
+
+    def queue_depth(self) -> dict[str, int]:
+        return {method: len(bucket) for method, bucket in self._buckets.items()}
+
+    async def call(self, method: str, func, *args, priority: int = PRIORITY_BULK, **kwargs):
+        bucket = self.bucket(method)
+        attempt = 0
+        while True:
+            queued = time.perf_counter()
+            await bucket.acquire(priority)
+            started = time.perf_counter()
+            slack_api_queue_seconds.labels(method).observe(started - queued)
+            try:
+                return await func(*args, **kwargs)
+            except SlackApiError as e:
+                if e.response.status_code != 429:
+                    slack_api_errors_total.labels(method, slack_error_code(e)).inc()
+                    raise
+                slack_api_ratelimited_total.labels(method).inc()
+                if attempt >= self.max_retries:
+                    slack_api_errors_total.labels(method, "ratelimited").inc()
+                    raise
+                attempt += 1
+                retry_after = _retry_after(e.response.headers)
+                logger.warning("Rate limited on %s, retrying in %ss (attempt %s)", method, retry_after, attempt)
+                bucket.block_for(retry_after)
+            except Exception:
+                slack_api_errors_total.labels(method, "exception").inc()
+                raise
+            finally:
+                slack_api_request_seconds.labels(method).observe(time.perf_counter() - started)
+
+
+def slack_error_code(e: SlackApiError) -> str:
+    """Slack's error code for a failed call, or ``http_<status>`` when the body had none (e.g. a 503)."""
+    data = e.response.data
+    return (data.get("error") if isinstance(data, dict) else None) or f"http_{e.response.status_code}"
+
+
+def _retry_after(headers) -> float:
+    value = headers.get("Retry-After") or headers.get("retry-after") or 1
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+scheduler = SlackRateScheduler()
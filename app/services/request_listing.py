@@ -0,0 +1,77 @@
+"""Filtered, keyset-paginated listing of ``channel_requests``.
+
+Pages are ordered newest first on ``(created_at, id)`` and the cursor is the
+last row's key, so every page is an index range scan no matter how deep it
+is, unlike OFFSET which reads and discards all earlier rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.channel_request import ChannelRequest
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, request_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), request_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of ``encode_cursor``. Raises ``ValueError`` for a malformed cursor."""
+    try:
+        created_at, request_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(created_at), int(request_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def list_requests(
+    db: AsyncSession,
+    status: Optional[str] = None,
+    requester: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    channel_prefix: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> tuple[list[ChannelRequest], Optional[str]]:
+    """Return one page of matching requests and the cursor for the next page, if any."""
+    query = select(ChannelRequest)
+    if status is not None:
+        query = query.where(ChannelRequest.status == status)
+    if requester is not None:
+        query = query.where(ChannelRequest.requester_email == requester)
+    if created_after is not None:
+        query = query.where(ChannelRequest.created_at >= created_after)
+    if created_before is not None:
+        query = query.where(ChannelRequest.created_at < created_before)
+    if channel_prefix:
+        # A range rather than LIKE so the channel_name index is usable on every
+        # backend (SQLite's case-insensitive LIKE cannot use a plain index)
+        query = query.where(
+            ChannelRequest.channel_name >= channel_prefix,
+            ChannelRequest.channel_name < channel_prefix + "\U0010ffff",
+        )
+    if cursor is not None:
+        after_created_at, after_id = decode_cursor(cursor)
+        query = query.where(
+            or_(
+                ChannelRequest.created_at < after_created_at,
+                and_(ChannelRequest.created_at == after_created_at, ChannelRequest.id < after_id),
+            )
+        )
+
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    # One extra row tells us whether there is a next page without a COUNT
+    query = query.order_by(ChannelRequest.created_at.desc(), ChannelRequest.id.desc()).limit(limit + 1)
+    rows = list((await db.execute(query)).scalars())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
@@ -0,0 +1,241 @@
+"""Retention for ``channel_requests``.
+
+Completed requests (``created``, ``failed`` and ``dead_letter``) whose
+``completed_at`` is more than ``RETENTION_DAYS`` old are moved out of the hot
+table. They go either to ``channel_requests_archive``, where the bulky columns
+are compressed into one blob per row, or to gzipped JSON-lines files under
+``RETENTION_ARCHIVE_DIR``, one file per day. Rows move in batches of
+``RETENTION_BATCH_SIZE``. Each batch is one short transaction, with a pause
+before the next one, so a sweep can run online next to the request path.
+
+A file archive is written and synced before its rows are deleted. A crash in
+between can leave a row in both places, but never in neither. Either way, the
+form submission IDs of archived rows are kept in ``archived_submissions``, so
+replays are still recognised as duplicates.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models.archived_submission import ArchivedSubmission
+from app.models.channel_request import ChannelRequest
+from app.models.channel_request_archive import ChannelRequestArchive
+from app.services.leases import SKIP_LOCKED_BACKENDS
+from app.services.metrics import channel_requests_archived_total
+
+RETENTION_DAYS = settings.retention_days
+RETENTION_ARCHIVE = settings.retention_archive
+RETENTION_ARCHIVE_DIR = settings.retention_archive_dir
+RETENTION_BATCH_SIZE = settings.retention_batch_size
+RETENTION_BATCH_PAUSE = settings.retention_batch_pause
+RETENTION_INTERVAL = settings.retention_interval
+
+FINAL_STATUSES = ('created', 'failed', 'dead_letter')
+# Kept as columns of the archive table; the rest go into its compressed payload
+ARCHIVE_COLUMNS = (
+    "id", "channel_name", "channel_id", "requester_email", "status",
+    "team_id", "batch_id", "form_submission_id", "created_at", "completed_at",
+)
+PAYLOAD_COLUMNS = ("requester_name", "visibility", "users_to_add", "invite_results", "error_message", "attempts")
+_SELECTED = [ChannelRequest.__table__.c[name] for name in ARCHIVE_COLUMNS + PAYLOAD_COLUMNS]
+
+logger = logging.getLogger(__name__)
+
+
+def pack_payload(row) -> bytes:
+    payload = {name: row[name] for name in PAYLOAD_COLUMNS}
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+
+
+def unpack_payload(payload: bytes) -> dict:
+    """Inverse of ``pack_payload``, for reading ``ChannelRequestArchive.payload``."""
+    return json.loads(zlib.decompress(payload))
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def _write_file(rows, archive_dir: str):
+    path = Path(archive_dir) / f"channel_requests-{datetime.utcnow():%Y-%m-%d}.jsonl.gz"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = "".join(json.dumps(dict(row), default=_json_default, separators=(",", ":")) + "\n" for row in rows)
+    # Each batch appends one gzip member; gzip readers see consecutive members as one stream
+    with open(path, "ab") as f:
+        f.write(gzip.compress(lines.encode()))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def archive_batch(
+    cutoff: datetime,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    archive: str = RETENTION_ARCHIVE,
+    archive_dir: str = RETENTION_ARCHIVE_DIR,
+) -> int:
+    """Move up to ``batch_size`` completed rows older than ``cutoff`` to the archive; returns how many moved."""
+    query = (
+        select(*_SELECTED)
+        .where(ChannelRequest.status.in_(FINAL_STATUSES), ChannelRequest.completed_at < cutoff)
+        .order_by(ChannelRequest.completed_at)
+        .limit(batch_size)
+    )
+    with SessionLocal() as db:
+        if db.bind.dialect.name in SKIP_LOCKED_BACKENDS:
+            # Sweeps running in other processes take other rows instead of waiting
+            query = query.with_for_update(skip_locked=True)
+        rows = db.execute(query).mappings().all()
+        if not rows:
+            return 0
+        # Deleted first, re-checking the status, so a request sent back to the
+        # queue meanwhile stays put and is not archived
+        deleted = set(db.execute(
+            delete(ChannelRequest)
+            .where(ChannelRequest.id.in_([row["id"] for row in rows]), ChannelRequest.status.in_(FINAL_STATUSES))
+            .returning(ChannelRequest.id)
+            .execution_options(synchronize_session=False)
+        ).scalars())
+        rows = [row for row in rows if row["id"] in deleted]
+        if not rows:
+            db.commit()
+            return 0
+        if archive == "file":
+            # Synced before the delete commits
+            _write_file(rows, archive_dir)
+        else:
+            db.execute(
+                insert(ChannelRequestArchive),
+                [{**{name: row[name] for name in ARCHIVE_COLUMNS}, "payload": pack_payload(row)} for row in rows],
+            )
+        # Replays of these submissions must still be recognised once the rows are gone
+        submissions = [
+            {
+                "form_submission_id": row["form_submission_id"],
+                "request_id": row["id"],
+                "channel_name": row["channel_name"],
+                "channel_id": row["channel_id"],
+                "status": row["status"],
+                "created_at": row["created_at"],
+            }
+            for row in rows
+            if row["form_submission_id"]
+        ]
+        if submissions:
+            db.execute(insert(ArchivedSubmission), submissions)
+        db.commit()
+    channel_requests_archived_total.labels(archive).inc(len(rows))
+    return len(rows)
+
+
+def run_retention(
+    days: int = RETENTION_DAYS,
+    archive: str = RETENTION_ARCHIVE,
+    archive_dir: str = RETENTION_ARCHIVE_DIR,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_BATCH_PAUSE,
+    stop: Optional[threading.Event] = None,
+) -> dict:
+    """Archive every row past its retention, one batch at a time, then compact. Blocking."""
+    started = time.perf_counter()
+    archived = batches = 0
+    if days > 0:
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        while stop is None or not stop.is_set():
+            try:
+                moved = archive_batch(cutoff, batch_size, archive, archive_dir)
+            except IntegrityError:
+                # Another process archived these rows first (backends without SKIP LOCKED)
+                logger.warning("Retention batch collided with a concurrent sweep; stopping this sweep")
+                break
+            archived += moved
+            batches += bool(moved)
+            if moved < batch_size:
+                break
+            time.sleep(pause)
+    if archived:
+        compact()
+        logger.info("Archived %s channel requests to %s in %s batches", archived, archive, batches)
+    return {"archived": archived, "batches": batches, "seconds": round(time.perf_counter() - started, 3)}
+
+
+def compact():
+    """Make the space freed by a sweep reusable without blocking request writes.
+
+    Deleted pages are reused by new rows, so the hot table stops growing. On
+    SQLite databases switched to incremental auto-vacuum (see ``vacuum``), they
+    are also returned to the filesystem. Postgres and MySQL reclaim space on
+    their own (autovacuum, purge).
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            connection.exec_driver_sql("PRAGMA incremental_vacuum")
+        # Move the sweep's pages from the WAL into the database without waiting on readers
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+        connection.commit()
+
+
+def vacuum():
+    """Rebuild the tables at their minimal size. Offline maintenance.
+
+    On SQLite this blocks all writes while it runs. It also switches the file
+    to incremental auto-vacuum, so later sweeps can shrink it online. On
+    Postgres it runs a plain (non-blocking) ``VACUUM ANALYZE`` of the table.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.exec_driver_sql("VACUUM")
+        elif engine.dialect.name == "postgresql":
+            connection.exec_driver_sql("VACUUM ANALYZE channel_requests")
+
+
+class RetentionService:
+    """Runs ``run_retention`` every ``interval`` seconds in a worker thread."""
+
+    def __init__(self, interval: float = RETENTION_INTERVAL, days: int = RETENTION_DAYS):
+        self.interval = interval
+        self.days = days
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None and self.interval > 0 and self.days > 0:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            # A sweep in progress finishes its current batch and returns
+            self._stop.set()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        # The first sweep waits a little, so it does not compete with startup
+        delay = min(self.interval, 60)
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.interval
+            try:
+                await asyncio.to_thread(run_retention, self.days, stop=self._stop)
+            except Exception as e:
+                logger.error("Retention sweep failed: %s", e)
+
+
+retention = RetentionService()
@@ -0,0 +1,69 @@
+"""Retry policy for channel requests.
+
+Failures are classified by error code. Slack rate limiting, Slack-side outages,
+timeouts, connection errors and database hiccups are retryable. Everything
+else (``name_taken``, ``invalid_name``, ``missing_scope``, ...) would fail the
+same way again. A retryable failure puts the request back to ``pending`` with
+``next_attempt_at`` pushed out by jittered exponential backoff. After
+``CHANNEL_MAX_ATTEMPTS`` it moves to ``dead_letter`` instead.
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+import aiohttp
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+
+CHANNEL_MAX_ATTEMPTS = settings.channel_max_attempts
+CHANNEL_RETRY_BASE_DELAY = settings.channel_retry_base_delay
+CHANNEL_RETRY_MAX_DELAY = settings.channel_retry_max_delay
+
+RETRYABLE_ERRORS = frozenset({
+    # Slack error codes
+    "ratelimited",
+    "internal_error",
+    "fatal_error",
+    "request_timeout",
+    "service_unavailable",
+    "team_added_to_org",
+    # Codes from error_code() for failures outside the Slack API
+    "timeout",
+    "connection_error",
+    "database_error",
+})
+
+
+def error_code(error: BaseException) -> str:
+    """A short, classifiable code for ``error``: Slack's error code where there is one."""
+    code = getattr(error, "error", None)
+    if isinstance(code, str):
+        return code
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(error, (aiohttp.ClientError, ConnectionError)):
+        return "connection_error"
+    if isinstance(error, OperationalError):
+        return "database_error"
+    return str(error) or type(error).__name__
+
+
+def is_retryable(code: Optional[str]) -> bool:
+    # http_5xx: Slack answered with a server error and no error code
+    return code in RETRYABLE_ERRORS or (code or "").startswith("http_5")
+
+
+def next_attempt_at(
+    attempts: int,
+    now: Optional[datetime] = None,
+    base_delay: float = CHANNEL_RETRY_BASE_DELAY,
+    max_delay: float = CHANNEL_RETRY_MAX_DELAY,
+) -> datetime:
+    """When to try again after ``attempts`` failed attempts."""
+    delay = min(max_delay, base_delay * 2 ** max(attempts - 1, 0))
+    # Equal jitter: spreads out retries of requests that failed together, but
+    # never waits less than half the delay
+    delay = delay / 2 + random.uniform(0, delay / 2)
+    return (now or datetime.utcnow()) + timedelta(seconds=delay)
@@ -1,124 +1,450 @@
-import os
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
 from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
-from dotenv import load_dotenv
+from app.config import settings
+from app.services.rate_limiter import PRIORITY_BULK, PRIORITY_INTERACTIVE, slack_error_code
+from app.services.retries import error_code
+from app.services.user_cache import MISSING
+from app.services.templates import templates
+from app.services.workspaces import (
+    SLACK_API_BASE_URL,
+    SLACK_BOT_TOKEN,
+    Workspace,
+    get_http_session,
+    workspaces,
+)
 import logging
 import json
-import requests
 
-load_dotenv()
-SLACK_BOT_TOKEN = os.getenv('SLACK_BOT_TOKEN')
-SLACK_SIGNING_SECRET = os.getenv('SLACK_SIGNING_SECRET')
+SLACK_SIGNING_SECRET = settings.slack_signing_secret
+SLACK_USER_CACHE_WARM_INTERVAL = settings.slack_user_cache_warm_interval
+SLACK_USER_CACHE_WARM_ON_STARTUP = settings.slack_user_cache_warm_on_startup
+SLACK_CHANNEL_INDEX_REFRESH_INTERVAL = settings.slack_channel_index_refresh_interval
+# Slack accepts at most 1000 users per conversations.invite call
+SLACK_INVITE_CHUNK_SIZE = min(settings.slack_invite_chunk_size, 1000)
+SLACK_INVITE_MAX_ATTEMPTS = settings.slack_invite_max_attempts
 
-client = WebClient(token=SLACK_BOT_TOKEN)
 logger = logging.getLogger(__name__)
 
+_sync_client: Optional[WebClient] = None
+
+
+class SlackServiceError(RuntimeError):
+    """A Slack API call failed. ``error`` holds Slack's error code, e.g. ``name_taken``."""
+
+    def __init__(self, error: str):
+        super().__init__(f"Slack API error: {error}")
+        self.error = error
+
+
+class ChannelNameError(SlackServiceError):
+    """A channel name was rejected, locally or by Slack, with free alternatives in ``suggestions``."""
+
+    def __init__(self, error: str, suggestions: list[str]):
+        super().__init__(error)
+        self.suggestions = suggestions
+
+
+def check_channel_name(name: str, team_id: Optional[str] = None) -> Optional[ChannelNameError]:
+    """Validate ``name`` against Slack's rules and the workspace's channel index, without any API call."""
+    index = workspaces.get(team_id).channel_index
+    error = index.check(name)
+    if error is None:
+        return None
+    return ChannelNameError(error, index.suggest(name))
+
+
+def get_async_client(team_id: Optional[str] = None) -> AsyncWebClient:
+    """Return the async Slack client of the workspace serving ``team_id``."""
+    return workspaces.get(team_id).client()
+
+
+def get_sync_client() -> WebClient:
+    """Return the synchronous client of the default workspace, for scripts and the sync wrappers below."""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = WebClient(token=SLACK_BOT_TOKEN, base_url=SLACK_API_BASE_URL)
+    return _sync_client
+
+
+async def close_async_client():
+    """Stop every workspace's background loads and close the shared HTTP session. Called on shutdown."""
+    await workspaces.close()
+
+
+def channel_creation_modal_view(channel_name: Optional[str] = None) -> str:
+    """The channel creation modal as JSON, with the name field pre-filled if ``channel_name`` is given."""
+    if channel_name:
+        return templates.render("channel_creation_modal_prefilled", channel_name=channel_name)
+    return templates.render("channel_creation_modal")
+
+
+def channel_result_view(text: str) -> str:
+    return templates.render("channel_result_view", text=text)
+
+
+def _delayed_response_payload(message: str, response_type: str, blocks: list = None) -> dict:
+    payload = {
+        "text": message,
+        "response_type": response_type
+    }
+
+    if blocks:
+        payload["blocks"] = blocks
+    return payload
+
+
+# Async API used by the routers. Every call is queued through the rate scheduler.
+
+async def create_channel_async(
+    name: str, is_private: bool = False, priority: int = PRIORITY_BULK, team_id: Optional[str] = None
+):
+    workspace = workspaces.get(team_id)
+    channel_index = workspace.channel_index
+    problem = check_channel_name(name, team_id)
+    if problem is not None:
+        raise problem
+
+    async def create():
+        try:
+            response = await workspace.scheduler.call(
+                "conversations.create",
+                workspace.client().conversations_create,
+                name=name,
+                is_private=is_private,
+                priority=priority,
+            )
+        except SlackApiError as e:
+            if slack_error_code(e) == "name_taken":
+                channel_index.add(name)
+                raise ChannelNameError("name_taken", channel_index.suggest(name))
+            raise SlackServiceError(slack_error_code(e))
+        channel_index.add(name)
+        return response['channel']['id']
+
+    return await workspace.channel_creates.do(name.lower(), create)
+
+async def lookup_user_async(email: str, priority: int = PRIORITY_BULK, team_id: Optional[str] = None):
+    workspace = workspaces.get(team_id)
+    user_cache = workspace.user_cache
+    cached = user_cache.get(email)
+    if cached is None:
+        raise SlackServiceError("users_not_found")
+    if cached is not MISSING:
+        return cached
+    try:
+        resp = await workspace.scheduler.call(
+            "users.lookupByEmail", workspace.client().users_lookupByEmail, email=email, priority=priority
+        )
+    except SlackApiError as e:
+        if slack_error_code(e) == "users_not_found":
+            user_cache.set(email, None)
+        raise SlackServiceError(slack_error_code(e))
+    user_id = resp['user']['id']
+    user_cache.set(email, user_id)
+    return user_id
+
+async def warm_user_cache_async(workspace: Optional[Workspace] = None) -> int:
+    """Load a workspace's whole directory into its user cache with a paginated users.list sweep."""
+    workspace = workspace or workspaces.default
+    client = workspace.client()
+    cursor = None
+    loaded = 0
+    while True:
+        try:
+            resp = await workspace.scheduler.call("users.list", client.users_list, limit=200, cursor=cursor)
+        except SlackApiError as e:
+            raise SlackServiceError(slack_error_code(e))
+        for member in resp.get("members", []):
+            email = member.get("profile", {}).get("email")
+            if email and not member.get("deleted"):
+                workspace.user_cache.set(email, member["id"])
+                loaded += 1
+        cursor = resp.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            break
+    logger.info("Warmed user cache of workspace %s with %s users", workspace.team_id or "default", loaded)
+    return loaded
+
+async def _list_channels(workspace: Workspace):
+    """Yield every channel of a workspace, paging through conversations.list."""
+    client = workspace.client()
+    cursor = None
+    while True:
+        try:
+            resp = await workspace.scheduler.call(
+                "conversations.list",
+                client.conversations_list,
+                types="public_channel,private_channel",
+                exclude_archived=False,
+                limit=1000,
+                cursor=cursor,
+            )
+        except SlackApiError as e:
+            raise SlackServiceError(slack_error_code(e))
+        for channel in resp.get("channels", []):
+            yield channel
+        cursor = resp.get("response_metadata", {}).get("next_cursor")
+        if not cursor:
+            break
+
+async def load_channel_index_async(workspace: Optional[Workspace] = None) -> int:
+    """Rebuild a workspace's channel name index with a paginated conversations.list sweep."""
+    workspace = workspace or workspaces.default
+    names = {channel["name"] async for channel in _list_channels(workspace)}
+    workspace.channel_index.replace(names)
+    logger.info("Loaded %s channel names into the index of workspace %s", len(names), workspace.team_id or "default")
+    return len(names)
+
+async def _bot_user_id(workspace: Workspace) -> str:
+    if workspace.bot_user_id is None:
+        try:
+            resp = await workspace.scheduler.call("auth.test", workspace.client().auth_test)
+        except SlackApiError as e:
+            raise SlackServiceError(slack_error_code(e))
+        workspace.bot_user_id = resp["user_id"]
+    return workspace.bot_user_id
+
+async def find_own_channel_async(name: str, since: datetime, team_id: Optional[str] = None) -> Optional[str]:
+    """ID of channel ``name`` if this app's bot created it at or after ``since`` (naive UTC), else None.
+
+    Finds the channel of an earlier attempt that created it but never recorded its ID.
+    """
+    workspace = workspaces.get(team_id)
+    bot_user_id = await _bot_user_id(workspace)
+    # Slack's created is whole seconds
+    since_ts = int(since.replace(tzinfo=timezone.utc).timestamp())
+    async for channel in _list_channels(workspace):
+        if channel["name"] == name.lower():
+            if channel.get("creator") == bot_user_id and channel.get("created", 0) >= since_ts:
+                return channel["id"]
+            return None
+    return None
+
+# Background loads take the workspace itself rather than its team_id, so they
+# do not count as use and an idle workspace can still be evicted
+
+async def _load_channel_index_forever(workspace: Workspace, interval: float):
+    while True:
+        try:
+            await load_channel_index_async(workspace)
+        except Exception as e:
+            logger.error("Channel index load failed: %s", e)
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+async def _warm_user_cache_forever(workspace: Workspace, interval: float):
+    while True:
+        try:
+            await warm_user_cache_async(workspace)
+        except Exception as e:
+            logger.error("User cache warm-up failed: %s", e)
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+def _start_background_loads(workspace: Workspace):
+    """Load the channel name index, and warm the user cache if enabled, for a new workspace."""
+    workspace.tasks.append(
+        asyncio.create_task(_load_channel_index_forever(workspace, SLACK_CHANNEL_INDEX_REFRESH_INTERVAL))
+    )
+    if SLACK_USER_CACHE_WARM_INTERVAL > 0 or SLACK_USER_CACHE_WARM_ON_STARTUP:
+        workspace.tasks.append(
+            asyncio.create_task(_warm_user_cache_forever(workspace, SLACK_USER_CACHE_WARM_INTERVAL))
+        )
+
+workspaces.on_create = _start_background_loads
+
+INVITED = "invited"
+# Invite outcomes that leave the user in the channel
+INVITE_OK = {INVITED, "already_in_channel"}
+# Errors worth another attempt; anything else (user_not_found, user_is_restricted,
+# channel_not_found, ...) will fail the same way again
+_TRANSIENT_INVITE_ERRORS = {"internal_error", "fatal_error", "request_timeout", "service_unavailable"}
+
+async def _invite_chunk(workspace: Workspace, channel: str, user_ids: list[str], priority: int) -> dict[str, str]:
+    """One conversations.invite call. With ``force`` Slack invites the valid users and lists the rest."""
+    try:
+        resp = await workspace.scheduler.call(
+            "conversations.invite",
+            workspace.client().conversations_invite,
+            channel=channel,
+            users=','.join(user_ids),
+            force=True,
+            priority=priority,
+        )
+        errors = resp.get("errors") or []
+    except SlackApiError as e:
+        errors = e.response.data.get("errors") if isinstance(e.response.data, dict) else None
+        if not errors:
+            # A call-level error (channel_not_found, not_in_channel, ...) applies to every user
+            return dict.fromkeys(user_ids, slack_error_code(e))
+    results = dict.fromkeys(user_ids, INVITED)
+    for item in errors:
+        if item.get("user") in results:
+            results[item["user"]] = item.get("error", "unknown_error")
+    return results
+
+async def invite_users_async(
+    channel: str, user_ids: list[str], priority: int = PRIORITY_BULK, team_id: Optional[str] = None
+) -> dict[str, str]:
+    """Invite users in concurrent chunks and return each user's outcome.
+
+    Maps every user ID to ``invited``, ``already_in_channel`` or the Slack error
+    that kept it out; a bad user no longer fails the others. Users whose chunk
+    hit a transient error are retried, up to ``SLACK_INVITE_MAX_ATTEMPTS``.
+    """
+    workspace = workspaces.get(team_id)
+    results = {}
+    remaining = list(dict.fromkeys(user_ids))
+    for attempt in range(SLACK_INVITE_MAX_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(2 ** (attempt - 1))
+        chunks = [remaining[i:i + SLACK_INVITE_CHUNK_SIZE] for i in range(0, len(remaining), SLACK_INVITE_CHUNK_SIZE)]
+        outcomes = await asyncio.gather(
+            *(_invite_chunk(workspace, channel, chunk, priority) for chunk in chunks), return_exceptions=True
+        )
+        remaining = []
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                # Connection errors and the like; the whole chunk is worth a retry
+                outcome = dict.fromkeys(chunk, error_code(outcome))
+                remaining.extend(chunk)
+            else:
+                remaining.extend(user for user, result in outcome.items() if result in _TRANSIENT_INVITE_ERRORS)
+            results.update(outcome)
+        if not remaining:
+            break
+    return results
+
+async def token_info_async(team_id: Optional[str] = None) -> dict:
+    """Return basic information about the Slack token using auth.test."""
+    workspace = workspaces.get(team_id)
+    try:
+        resp = await workspace.scheduler.call("auth.test", workspace.client().auth_test, priority=PRIORITY_INTERACTIVE)
+        return {
+            "user_id": resp.get("user_id"),
+            "team": resp.get("team"),
+            "url": resp.get("url"),
+        }
+    except SlackApiError as e:
+        raise SlackServiceError(slack_error_code(e))
+
+async def open_channel_creation_modal_async(
+    trigger_id: str, channel_name: Optional[str] = None, team_id: Optional[str] = None
+):
+    """Open a modal dialog for channel creation. Served ahead of any queued bulk work."""
+    workspace = workspaces.get(team_id)
+    try:
+        # The view goes out as the pre-serialized form field, not as a dict re-encoded by the SDK
+        response = await workspace.scheduler.call(
+            "views.open",
+            workspace.client().api_call,
+            api_method="views.open",
+            data={"trigger_id": trigger_id, "view": channel_creation_modal_view(channel_name)},
+            priority=PRIORITY_INTERACTIVE,
+        )
+        return response
+    except SlackApiError as e:
+        logger.error("Error opening modal: %s", e)
+        raise SlackServiceError(slack_error_code(e))
+
+async def update_view_async(view_id: str, view: str, team_id: Optional[str] = None):
+    """Replace the content of an open modal with a pre-serialized view, e.g. ``channel_result_view``."""
+    workspace = workspaces.get(team_id)
+    try:
+        return await workspace.scheduler.call(
+            "views.update",
+            workspace.client().api_call,
+            api_method="views.update",
+            data={"view_id": view_id, "view": view},
+            priority=PRIORITY_INTERACTIVE,
+        )
+    except SlackApiError as e:
+        raise SlackServiceError(slack_error_code(e))
+
+def _delayed_response_body(message: str, response_type: str, blocks: list = None) -> str:
+    if blocks or response_type not in ("ephemeral", "in_channel"):
+        return json.dumps(_delayed_response_payload(message, response_type, blocks))
+    return templates.render(f"{response_type}_message", message=message)
+
+async def send_delayed_response_async(response_url: str, message: str, response_type: str = "ephemeral", blocks: list = None):
+    """Send a delayed response to a slash command over the shared HTTP session."""
+    body = _delayed_response_body(message, response_type, blocks)
+
+    try:
+        async with get_http_session().post(
+            response_url, data=body, headers={"Content-Type": "application/json"}
+        ) as response:
+            return response.status == 200
+    except Exception as e:
+        logger.error("Error sending delayed response: %s", e)
+        return False
+
+
+# Synchronous wrappers, kept for scripts and one-off use outside the event loop
+
 def create_channel(name: str, is_private: bool = False):
     try:
-        response = client.conversations_create(
+        response = get_sync_client().conversations_create(
             name=name,
             is_private=is_private
         )
         return response['channel']['id']
     except SlackApiError as e:
-        raise RuntimeError(f"Slack API error: {e.response['error']}")
+        raise SlackServiceError(slack_error_code(e))
 
 def lookup_user(email: str):
     try:
-        resp = client.users_lookupByEmail(email=email)
+        resp = get_sync_client().users_lookupByEmail(email=email)
         return resp['user']['id']
     except SlackApiError as e:
-        raise RuntimeError(f"Slack API error: {e.response['error']}")
+        raise SlackServiceError(slack_error_code(e))
 
 def invite_users(channel: str, user_ids: list[str]):
     try:
-        client.conversations_invite(channel=channel, users=','.join(user_ids))
+        get_sync_client().conversations_invite(channel=channel, users=','.join(user_ids))
     except SlackApiError as e:
-        raise RuntimeError(f"Slack API error: {e.response['error']}")
+        raise SlackServiceError(slack_error_code(e))
 
 def token_info() -> dict:
     """Return basic information about the Slack token using auth.test."""
     try:
-        resp = client.auth_test()
+        resp = get_sync_client().auth_test()
         return {
             "user_id": resp.get("user_id"),
             "team": resp.get("team"),
             "url": resp.get("url"),
         }
     except SlackApiError as e:
-        raise RuntimeError(f"Slack API error: {e.response['error']}")
+        raise SlackServiceError(slack_error_code(e))
 
 def open_channel_creation_modal(trigger_id: str):
     """Open a modal dialog for channel creation."""
     try:
-        modal_view = {
-            "type": "modal",
-            "callback_id": "channel_creation_modal",
-            "title": {"type": "plain_text", "text": "Create Channel"},
-            "submit": {"type": "plain_text", "text": "Create"},
-            "close": {"type": "plain_text", "text": "Cancel"},
-            "blocks": [
-                {
-                    "type": "input",
-                    "block_id": "channel_name_block",
-                    "element": {
-                        "type": "plain_text_input",
-                        "action_id": "channel_name_input",
-                        "placeholder": {"type": "plain_text", "text": "e.g. project-name"}
-                    },
-                    "label": {"type": "plain_text", "text": "Channel Name"}
-                },
-                {
-                    "type": "input",
-                    "block_id": "channel_type_block",
-                    "element": {
-                        "type": "static_select",
-                        "action_id": "channel_type_select",
-                        "options": [
-                            {"text": {"type": "plain_text", "text": "Public"}, "value": "Public"},
-                            {"text": {"type": "plain_text", "text": "Private"}, "value": "Private"}
-                        ],
-                        "initial_option": {"text": {"type": "plain_text", "text": "Public"}, "value": "Public"}
-                    },
-                    "label": {"type": "plain_text", "text": "Channel Type"}
-                },
-                {
-                    "type": "input",
-                    "block_id": "users_block",
-                    "optional": True,
-                    "element": {
-                        "type": "multi_users_select",
-                        "action_id": "users_select",
-                        "placeholder": {"type": "plain_text", "text": "Select users to add"}
-                    },
-                    "label": {"type": "plain_text", "text": "Users to Add (Optional)"}
-                }
-            ]
-        }
-        
-        response = client.views_open(trigger_id=trigger_id, view=modal_view)
+        response = get_sync_client().api_call(
+            "views.open", data={"trigger_id": trigger_id, "view": channel_creation_modal_view()}
+        )
         return response
     except SlackApiError as e:
-        logger.error(f"Error opening modal: {e}")
-        raise RuntimeError(f"Slack API error: {e.response['error']}")
+        logger.error("Error opening modal: %s", e)
+        raise SlackServiceError(slack_error_code(e))
 
 def send_delayed_response(response_url: str, message: str, response_type: str = "ephemeral", blocks: list = None):
     """Send a delayed response to a slash command."""
-    payload = {
-        "text": message,
-        "response_type": response_type
-    }
-    
-    if blocks:
-        payload["blocks"] = blocks
-        
+    import requests  # only scripts use the sync wrappers, so keep it off the import path
+
     try:
         response = requests.post(
             response_url,
             headers={"Content-Type": "application/json"},
-            data=json.dumps(payload)
+            data=_delayed_response_body(message, response_type, blocks)
         )
         return response.status_code == 200
     except Exception as e:
-        logger.error(f"Error sending delayed response: {e}")
+        logger.error("Error sending delayed response: %s", e)
         return False
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import update
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.channel_request import ChannelRequest
+from app.services.metrics import Gauge
+from app.services.leases import WORKER_ID
+
+STATUS_FLUSH_INTERVAL = settings.status_flush_interval
+STATUS_FLUSH_SIZE = settings.status_flush_size
+STATUS_FLUSH_MAX_ATTEMPTS = settings.status_flush_max_attempts
+
+logger = logging.getLogger(__name__)
+
+
+async def _write_updates(rows: list[dict]):
+    # ORM bulk UPDATE by primary key: one executemany in one transaction. Fenced
+    # on the lease, so a worker whose lease expired cannot overwrite the new owner.
+    statement = (
+        update(ChannelRequest)
+        .where(ChannelRequest.lease_owner == WORKER_ID)
+        .execution_options(synchronize_session=None)
+    )
+    async with AsyncSessionLocal() as db:
+        await db.execute(statement, rows)
+        await db.commit()
+
+
+class StatusWriter:
+    """Write-behind batcher for ``ChannelRequest`` result updates.
+
+    Workers hand over their final row changes and move on; the changes are
+    committed together in one transaction every ``flush_interval`` seconds or
+    once ``flush_size`` of them are waiting. Only rows leased to this process
+    are written. A row whose write fails ``max_attempts`` flushes in a row is
+    dropped, and its futures fail with the error.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = STATUS_FLUSH_INTERVAL,
+        flush_size: int = STATUS_FLUSH_SIZE,
+        max_attempts: int = STATUS_FLUSH_MAX_ATTEMPTS,
+    ):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_attempts = max_attempts
+        self._pending: dict[int, dict] = {}
+        self._waiters: dict[int, list[asyncio.Future]] = {}
+        # Failed flushes per row since its last successful write
+        self._failures: dict[int, int] = {}
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._task is None:
+            self._full = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def record(self, request_id: int, **fields) -> asyncio.Future:
+        """Queue an update for one row. The returned future resolves once it is committed."""
+        self._pending.setdefault(request_id, {"id": request_id}).update(fields)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(request_id, []).append(future)
+        if self._task is None:
+            # Not running as a background service (e.g. CLI); write straight through
+            asyncio.ensure_future(self.flush())
+        elif len(self._pending) >= self.flush_size:
+            self._full.set()
+        return future
+
+    async def flush(self):
+        if not self._pending:
+            return
+        rows, self._pending = list(self._pending.values()), {}
+        waiters, self._waiters = self._waiters, {}
+        try:
+            await _write_updates(rows)
+        except Exception as e:
+            logger.error("Failed to write %s status updates: %s", len(rows), e)
+            for row in rows:
+                request_id = row["id"]
+                failures = self._failures.get(request_id, 0) + 1
+                if failures >= self.max_attempts:
+                    # Give up on the row; its worker releases it and the lease lapses
+                    logger.error("Dropping status update for channel request %s after %s failed writes", request_id, failures)
+                    self._failures.pop(request_id, None)
+                    for future in waiters.pop(request_id, []):
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                # Keep the row for the next flush; newer updates for the same row win
+                self._failures[request_id] = failures
+                self._pending[request_id] = {**row, **self._pending.get(request_id, {})}
+                self._waiters[request_id] = waiters.pop(request_id, []) + self._waiters.get(request_id, [])
+            return
+        for row in rows:
+            self._failures.pop(row["id"], None)
+        for futures in waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            await self.flush()
+
+
+status_writer = StatusWriter()
+
+Gauge(
+    "status_writer_pending",
+    "Channel request updates waiting for the next batched commit",
+    callback=lambda: len(status_writer._pending),
+)
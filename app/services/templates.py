@@ -0,0 +1,142 @@
+"""Pre-serialized Block Kit views and message payloads.
+
+Each template is declared once as a plain dict whose string values may hold
+``{{field}}`` placeholders. It is serialized to JSON when it is registered, and
+rendering only splices JSON-escaped values into that string. No dict is built
+or re-serialized per request. To add a template, add an entry to ``TEMPLATES``
+or call ``templates.register``.
+"""
+import copy
+import json
+import re
+from json.encoder import encode_basestring_ascii
+
+_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+class Template:
+    """A payload serialized once, split around its ``{{field}}`` placeholders."""
+
+    def __init__(self, name: str, payload: dict):
+        self.name = name
+        self.json = json.dumps(payload, separators=(",", ":"))
+        pieces = _PLACEHOLDER.split(self.json)
+        self._literals = pieces[0::2]
+        self.fields = tuple(pieces[1::2])
+
+    def render(self, **values) -> str:
+        """Return the payload JSON with each placeholder replaced by ``str(values[field])``."""
+        if not self.fields:
+            return self.json
+        parts = [self._literals[0]]
+        for field, literal in zip(self.fields, self._literals[1:]):
+            try:
+                value = values[field]
+            except KeyError:
+                raise KeyError(f"Template {self.name!r} needs a value for {field!r}") from None
+            # Placeholders sit inside JSON strings, so splice in the escaped body without quotes
+            parts.append(encode_basestring_ascii(str(value))[1:-1])
+            parts.append(literal)
+        return "".join(parts)
+
+
+class TemplateRegistry:
+    def __init__(self, definitions: dict = None):
+        self._templates: dict[str, Template] = {}
+        for name, payload in (definitions or {}).items():
+            self.register(name, payload)
+
+    def register(self, name: str, payload: dict) -> Template:
+        template = self._templates[name] = Template(name, payload)
+        return template
+
+    def get(self, name: str) -> Template:
+        return self._templates[name]
+
+    def render(self, name: str, **values) -> str:
+        return self._templates[name].render(**values)
+
+
+def _text(text: str) -> dict:
+    return {"type": "plain_text", "text": text}
+
+
+_CHANNEL_CREATION_MODAL = {
+    "type": "modal",
+    "callback_id": "channel_creation_modal",
+    "title": _text("Create Channel"),
+    "submit": _text("Create"),
+    "close": _text("Cancel"),
+    "blocks": [
+        {
+            "type": "input",
+            "block_id": "channel_name_block",
+            "element": {
+                "type": "plain_text_input",
+                "action_id": "channel_name_input",
+                "placeholder": _text("e.g. project-name"),
+            },
+            "label": _text("Channel Name"),
+        },
+        {
+            "type": "input",
+            "block_id": "channel_type_block",
+            "element": {
+                "type": "static_select",
+                "action_id": "channel_type_select",
+                "options": [
+                    {"text": _text("Public"), "value": "Public"},
+                    {"text": _text("Private"), "value": "Private"},
+                ],
+                "initial_option": {"text": _text("Public"), "value": "Public"},
+            },
+            "label": _text("Channel Type"),
+        },
+        {
+            "type": "input",
+            "block_id": "users_block",
+            "optional": True,
+            "element": {
+                "type": "multi_users_select",
+                "action_id": "users_select",
+                "placeholder": _text("Select users to add"),
+            },
+            "label": _text("Users to Add (Optional)"),
+        },
+    ],
+}
+
+
+def _prefilled(modal: dict) -> dict:
+    # Slack rejects an empty initial_value, so the pre-filled modal is its own template
+    modal = copy.deepcopy(modal)
+    modal["blocks"][0]["element"]["initial_value"] = "{{channel_name}}"
+    return modal
+
+
+def _result_view(text: str) -> dict:
+    return {
+        "type": "modal",
+        "callback_id": "channel_creation_result",
+        "title": _text("Create Channel"),
+        "close": _text("Close"),
+        "blocks": [{"type": "section", "text": {"type": "mrkdwn", "text": text}}],
+    }
+
+
+TEMPLATES = {
+    # views.open / views.update payloads
+    "channel_creation_modal": _CHANNEL_CREATION_MODAL,
+    "channel_creation_modal_prefilled": _prefilled(_CHANNEL_CREATION_MODAL),
+    "channel_result_view": _result_view("{{text}}"),
+    # Interaction responses
+    "channel_progress_ack": {
+        "response_action": "update",
+        "view": _result_view(":hourglass_flowing_sand: Creating *#{{channel_name}}*..."),
+    },
+    # response_url messages
+    "ephemeral_message": {"text": "{{message}}", "response_type": "ephemeral"},
+    "in_channel_message": {"text": "{{message}}", "response_type": "in_channel"},
+}
+
+templates = TemplateRegistry(TEMPLATES)
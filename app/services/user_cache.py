@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+
+SLACK_USER_CACHE_SIZE = settings.slack_user_cache_size
+SLACK_USER_CACHE_TTL = settings.slack_user_cache_ttl
+SLACK_USER_CACHE_NEGATIVE_TTL = settings.slack_user_cache_negative_ttl
+
+# Returned by get() when the email has no live entry
+MISSING = object()
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+class UserDirectoryCache:
+    """Bounded email -> Slack user ID cache with TTL and LRU eviction.
+
+    Unknown emails are cached as ``None`` for a shorter negative TTL so repeated
+    typos do not keep costing ``users.lookupByEmail`` calls.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = SLACK_USER_CACHE_SIZE,
+        ttl: float = SLACK_USER_CACHE_TTL,
+        negative_ttl: float = SLACK_USER_CACHE_NEGATIVE_TTL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: OrderedDict[str, tuple[Optional[str], float]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, email: str):
+        """Return the cached user ID, ``None`` for a known-unknown email, or ``MISSING``."""
+        key = normalize_email(email)
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        user_id, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return MISSING
+        self._entries.move_to_end(key)
+        return user_id
+
+    def set(self, email: str, user_id: Optional[str]):
+        ttl = self.ttl if user_id is not None else self.negative_ttl
+        key = normalize_email(email)
+        self._entries[key] = (user_id, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def set_many(self, users: dict[str, str]):
+        for email, user_id in users.items():
+            self.set(email, user_id)
+
+    def clear(self):
+        self._entries.clear()
+
+
+user_cache = UserDirectoryCache()
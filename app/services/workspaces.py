@@ -0,0 +1,216 @@
+"""Per-workspace Slack state for deployments that serve several teams.
+
+Each workspace gets an async client for its own bot token, a rate scheduler,
+a user cache, a channel name index and its background loaders. Workspaces are
+created the first time a request for their ``team_id`` arrives and evicted
+after ``SLACK_WORKSPACE_IDLE_TTL`` seconds without use. All clients share one
+pooled HTTP session.
+
+The default workspace (``SLACK_BOT_TOKEN``) serves requests without a team and
+teams without a token of their own. It is never evicted, and it uses the
+module-level ``scheduler``, ``user_cache`` and ``channel_index``.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import aiohttp
+from slack_sdk.web.async_client import AsyncWebClient
+
+from app.config import settings
+from app.services.channel_names import ChannelNameIndex, channel_index
+from app.services.metrics import Gauge
+from app.services.rate_limiter import SlackRateScheduler, scheduler
+from app.services.single_flight import SingleFlight
+from app.services.user_cache import UserDirectoryCache, user_cache
+
+SLACK_BOT_TOKEN = settings.slack_bot_token
+SLACK_API_BASE_URL = settings.slack_api_base_url
+SLACK_HTTP_POOL_SIZE = settings.slack_http_pool_size
+SLACK_HTTP_TIMEOUT = settings.slack_http_timeout
+SLACK_WORKSPACE_TOKENS = settings.slack_workspace_tokens
+SLACK_WORKSPACE_IDLE_TTL = settings.slack_workspace_idle_ttl
+SLACK_WORKSPACE_MAX = settings.slack_workspace_max
+
+logger = logging.getLogger(__name__)
+
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the pooled HTTP session shared by all async Slack calls, created inside the running loop."""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=SLACK_HTTP_POOL_SIZE),
+            timeout=aiohttp.ClientTimeout(total=SLACK_HTTP_TIMEOUT),
+        )
+    return _http_session
+
+
+async def close_http_session():
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+def parse_workspace_tokens(value: str) -> dict[str, str]:
+    """Parse ``SLACK_WORKSPACE_TOKENS`` into ``{team_id: token}``."""
+    tokens = {}
+    for entry in value.split(","):
+        team_id, sep, token = entry.strip().partition(":")
+        if sep and team_id and token:
+            tokens[team_id] = token
+    return tokens
+
+
+class Workspace:
+    """Slack client, rate-limit state and caches for one team."""
+
+    def __init__(
+        self,
+        team_id: Optional[str],
+        token: Optional[str],
+        scheduler: Optional[SlackRateScheduler] = None,
+        user_cache: Optional[UserDirectoryCache] = None,
+        channel_index: Optional[ChannelNameIndex] = None,
+    ):
+        self.team_id = team_id
+        self.token = token
+        self.scheduler = scheduler or SlackRateScheduler()
+        self.user_cache = user_cache or UserDirectoryCache()
+        self.channel_index = channel_index or ChannelNameIndex()
+        # Concurrent creates of the same channel name share one conversations.create call
+        self.channel_creates = SingleFlight()
+        # The bot's own user ID (auth.test), fetched when first needed
+        self.bot_user_id: Optional[str] = None
+        self.tasks: list[asyncio.Task] = []
+        self.last_used = time.monotonic()
+        self._client: Optional[AsyncWebClient] = None
+
+    def client(self) -> AsyncWebClient:
+        """Return this workspace's async client, bound to the shared HTTP session."""
+        session = get_http_session()
+        if self._client is None or self._client.session is not session:
+            self._client = AsyncWebClient(
+                token=self.token, base_url=SLACK_API_BASE_URL, session=session, timeout=SLACK_HTTP_TIMEOUT
+            )
+        return self._client
+
+    def cancel_tasks(self):
+        """Cancel this workspace's background tasks without waiting; safe from any thread."""
+        for task in self.tasks:
+            task.get_loop().call_soon_threadsafe(task.cancel)
+        self.tasks = []
+
+    async def close(self):
+        """Stop this workspace's background tasks and wait for them to finish."""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+
+class WorkspaceRegistry:
+    """Maps ``team_id`` to a lazily created ``Workspace``, evicting idle ones.
+
+    ``on_create`` is called with each new workspace, on the event loop, so it
+    can start background tasks and add them to ``workspace.tasks``.
+    """
+
+    def __init__(
+        self,
+        tokens: dict[str, str],
+        default: Workspace,
+        idle_ttl: float = SLACK_WORKSPACE_IDLE_TTL,
+        max_workspaces: int = SLACK_WORKSPACE_MAX,
+    ):
+        self.tokens = tokens
+        self.default = default
+        self.idle_ttl = idle_ttl
+        self.max_workspaces = max_workspaces
+        self.on_create: Optional[Callable[[Workspace], None]] = None
+        self._workspaces: OrderedDict[str, Workspace] = OrderedDict()
+        self._default_started = False
+
+    def get(self, team_id: Optional[str] = None) -> Workspace:
+        """Return the workspace serving ``team_id`` and mark it as in use."""
+        now = time.monotonic()
+        token = self.tokens.get(team_id) if team_id else None
+        if token is None:
+            workspace = self.default
+            if not self._default_started:
+                self._default_started = True
+                self._created(workspace)
+        else:
+            workspace = self._workspaces.get(team_id)
+            if workspace is None:
+                workspace = self._workspaces[team_id] = Workspace(team_id, token)
+                logger.info("Created Slack workspace %s", team_id)
+                self._created(workspace)
+            else:
+                self._workspaces.move_to_end(team_id)
+        workspace.last_used = now
+        self._evict(now)
+        return workspace
+
+    def __iter__(self):
+        yield self.default
+        yield from list(self._workspaces.values())
+
+    def __len__(self) -> int:
+        return 1 + len(self._workspaces)
+
+    def _created(self, workspace: Workspace):
+        if self.on_create is None:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside the event loop (sync scripts); background loading is skipped
+            return
+        self.on_create(workspace)
+
+    def _evict(self, now: float):
+        # Least recently used first, so only the front of the dict needs checking
+        while self._workspaces:
+            team_id, workspace = next(iter(self._workspaces.items()))
+            if len(self._workspaces) <= self.max_workspaces and now - workspace.last_used < self.idle_ttl:
+                break
+            del self._workspaces[team_id]
+            logger.info("Evicted idle Slack workspace %s", team_id)
+            workspace.cancel_tasks()
+
+    async def start(self):
+        """Set up the default workspace and start its background loads."""
+        self.get()
+
+    async def close(self):
+        """Stop every workspace's background tasks and close the shared HTTP session."""
+        for workspace in self:
+            await workspace.close()
+        self._workspaces.clear()
+        self._default_started = False
+        await close_http_session()
+
+
+workspaces = WorkspaceRegistry(
+    parse_workspace_tokens(SLACK_WORKSPACE_TOKENS),
+    Workspace(None, SLACK_BOT_TOKEN, scheduler=scheduler, user_cache=user_cache, channel_index=channel_index),
+)
+
+
+
+def _queue_depth() -> dict:
+    depth = {}
+    for workspace in workspaces:
+        for method, waiting in workspace.scheduler.queue_depth().items():
+            depth[(method,)] = depth.get((method,), 0) + waiting
+    return depth
+
+
+Gauge("slack_workspaces", "Slack workspaces with live clients and caches, including the default", callback=lambda: len(workspaces))
+Gauge("slack_scheduler_waiting", "Slack Web API calls waiting in the rate schedulers of all workspaces", ("method",), callback=_queue_depth)
@@ -0,0 +1,210 @@
+"""Local stand-in for the Slack Web API, for benchmarks and load tests.
+
+Implements the methods this app calls with in-memory state:
+conversations.create/invite/list, users.lookupByEmail/list, views.open/update/push,
+auth.test and apps.permissions.info. Latency, 429 responses with ``Retry-After``,
+``name_taken`` errors and bodiless 503s can be injected.
+
+    python -m benchmarks.fake_slack --port 9100 --latency 0.05 --ratelimit-rate 0.02
+
+then run the app with ``SLACK_API_BASE_URL=http://127.0.0.1:9100/api/``.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+# The user every token authenticates as, and the creator of every channel
+BOT_USER_ID = "UBOT"
+
+
+@dataclass
+class FakeSlackConfig:
+    latency: float = 0.0            # mean seconds added to every call
+    jitter: float = 0.0             # +/- uniform seconds around the mean
+    ratelimit_rate: float = 0.0     # probability a call answers 429
+    retry_after: int = 1            # Retry-After seconds sent with 429s
+    name_taken_rate: float = 0.0    # probability conversations.create answers name_taken anyway
+    server_error_rate: float = 0.0  # probability a call answers 503 with no JSON body
+    users: int = 1000               # size of the generated user directory
+    page_size: int = 200            # max page size for list methods
+
+
+@dataclass
+class FakeSlackState:
+    channels: dict = field(default_factory=dict)    # name -> channel dict
+    members: dict = field(default_factory=dict)     # channel id -> set of user ids
+    calls: dict = field(default_factory=dict)       # method -> count
+    tokens: dict = field(default_factory=dict)      # bearer token -> count
+    ratelimited: int = 0
+    server_errors: int = 0
+
+
+def _ok(**data) -> JSONResponse:
+    return JSONResponse({"ok": True, **data})
+
+
+def _error(error: str, status_code: int = 200, headers: dict = None) -> JSONResponse:
+    return JSONResponse({"ok": False, "error": error}, status_code=status_code, headers=headers)
+
+
+def _page(items: list, params: dict, page_size: int) -> tuple[list, str]:
+    start = int(params.get("cursor") or 0)
+    limit = min(int(params.get("limit") or page_size), page_size)
+    end = start + limit
+    return items[start:end], str(end) if end < len(items) else ""
+
+
+def create_app(config: FakeSlackConfig = None) -> FastAPI:
+    config = config or FakeSlackConfig()
+    state = FakeSlackState()
+    ids = itertools.count(1)
+    users = [
+        {"id": f"U{i:08d}", "name": f"user{i}", "deleted": False, "profile": {"email": f"user{i}@example.com"}}
+        for i in range(config.users)
+    ]
+    users_by_email = {user["profile"]["email"]: user for user in users}
+    users_by_id = {user["id"]: user for user in users}
+
+    app = FastAPI(title="Fake Slack Web API")
+    app.state.config = config
+    app.state.slack = state
+
+    async def params_of(request: Request) -> dict:
+        params = dict(request.query_params)
+        body = await request.body()
+        if body:
+            if request.headers.get("content-type", "").startswith("application/json"):
+                params.update(json.loads(body))
+            else:
+                params.update((await request.form()).items())
+        return params
+
+    @app.api_route("/api/{method}", methods=["GET", "POST"])
+    async def api(method: str, request: Request):
+        params = await params_of(request)
+        state.calls[method] = state.calls.get(method, 0) + 1
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        state.tokens[token] = state.tokens.get(token, 0) + 1
+
+        delay = config.latency + random.uniform(-config.jitter, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if config.ratelimit_rate and random.random() < config.ratelimit_rate:
+            state.ratelimited += 1
+            return _error("ratelimited", 429, {"Retry-After": str(config.retry_after)})
+        if config.server_error_rate and random.random() < config.server_error_rate:
+            state.server_errors += 1
+            return PlainTextResponse("Service Unavailable", status_code=503)
+
+        if method == "auth.test":
+            return _ok(user_id=BOT_USER_ID, team="Fake Team", team_id="TFAKE", url="https://fake.slack.com/")
+        if method == "apps.permissions.info":
+            return _ok(info={"scopes": ["channels:manage", "groups:write", "users:read.email"]})
+
+        if method == "conversations.create":
+            name = params.get("name", "")
+            if name in state.channels or (config.name_taken_rate and random.random() < config.name_taken_rate):
+                return _error("name_taken")
+            is_private = str(params.get("is_private", "false")).lower() in ("1", "true")
+            channel = {
+                "id": f"C{next(ids):08d}",
+                "name": name,
+                "is_private": is_private,
+                "creator": BOT_USER_ID,
+                "created": int(time.time()),
+            }
+            state.channels[name] = channel
+            state.members[channel["id"]] = set()
+            return _ok(channel=channel)
+        if method == "conversations.invite":
+            members = state.members.get(params.get("channel"))
+            if members is None:
+                return _error("channel_not_found")
+            user_ids = [user_id for user_id in str(params.get("users", "")).split(",") if user_id]
+            if not user_ids:
+                return _error("no_user")
+            if len(user_ids) > 1000:
+                return _error("too_many_users")
+            errors = []
+            for user_id in user_ids:
+                if user_id not in users_by_id:
+                    errors.append({"user": user_id, "ok": False, "error": "user_not_found"})
+                elif user_id in members:
+                    errors.append({"user": user_id, "ok": False, "error": "already_in_channel"})
+            force = str(params.get("force", "false")).lower() in ("1", "true")
+            if errors and not force:
+                return _error(errors[0]["error"])
+            bad = {item["user"] for item in errors}
+            members.update(user_id for user_id in user_ids if user_id not in bad)
+            if errors:
+                return JSONResponse({"ok": False, "error": errors[0]["error"], "errors": errors})
+            return _ok(channel={"id": params["channel"]})
+        if method == "conversations.list":
+            channels, cursor = _page(list(state.channels.values()), params, config.page_size)
+            return _ok(channels=channels, response_metadata={"next_cursor": cursor})
+
+        if method == "users.lookupByEmail":
+            user = users_by_email.get(params.get("email", "").lower())
+            if user is None:
+                return _error("users_not_found")
+            return _ok(user=user)
+        if method == "users.list":
+            members, cursor = _page(users, params, config.page_size)
+            return _ok(members=members, response_metadata={"next_cursor": cursor})
+
+        if method in ("views.open", "views.push", "views.update"):
+            if method == "views.open" and not params.get("trigger_id"):
+                return _error("invalid_trigger_id")
+            return _ok(view={"id": params.get("view_id") or f"V{next(ids):08d}"})
+
+        return _error("unknown_method", 404)
+
+    @app.get("/_stats")
+    async def stats():
+        return {
+            "calls": state.calls,
+            "tokens": state.tokens,
+            "ratelimited": state.ratelimited,
+            "server_errors": state.server_errors,
+            "channels": len(state.channels),
+        }
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--name-taken-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    config = FakeSlackConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        ratelimit_rate=args.ratelimit_rate,
+        retry_after=args.retry_after,
+        name_taken_rate=args.name_taken_rate,
+        server_error_rate=args.server_error_rate,
+        users=args.users,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
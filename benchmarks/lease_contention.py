@@ -0,0 +1,125 @@
+"""Check lease-based claiming with several processes sharing one database.
+
+Seeds a fresh SQLite file (or ``--database-url``) with pending channel
+requests. Several worker processes then claim and complete them through
+``app.services.leases``, with no Slack calls. The check fails if any row is
+claimed by two live owners, or if a row is left unfinished. With
+``--crash-one``, one process claims a batch and exits without finishing it, and
+the others must reclaim those rows once the lease expires.
+
+    python -m benchmarks.lease_contention --rows 2000 --processes 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+
+def worker(database_url: str, index: int, batch: int, lease_seconds: float, crash: bool, barrier, results):
+    os.environ["DATABASE_URL"] = database_url
+    from sqlalchemy import update
+
+    from app.database import AsyncSessionLocal
+    from app.models.channel_request import ChannelRequest
+    from app.services.leases import WORKER_ID, claim_requests
+
+    # Start claiming together once every process has finished importing
+    barrier.wait()
+
+    async def run():
+        claimed = []
+        idle = 0
+        while idle < 3:
+            ids = await claim_requests(batch, lease_seconds=lease_seconds)
+            if crash:
+                # Simulate a process dying while holding leases
+                results.put((index, WORKER_ID, ids, True))
+                return
+            if not ids:
+                idle += 1
+                await asyncio.sleep(lease_seconds / 2)
+                continue
+            idle = 0
+            claimed.extend(ids)
+            # Finish the rows, fenced on our lease like the real status writer
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(ChannelRequest)
+                    .where(ChannelRequest.id.in_(ids), ChannelRequest.lease_owner == WORKER_ID)
+                    .values(status="created", lease_owner=None, lease_expires_at=None)
+                )
+                await db.commit()
+        results.put((index, WORKER_ID, claimed, False))
+
+    asyncio.run(run())
+
+
+def seed(database_url: str, rows: int):
+    os.environ["DATABASE_URL"] = database_url
+    from sqlalchemy import insert
+
+    from app.database import Base, SessionLocal, engine
+    from app.models.channel_request import ChannelRequest
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(insert(ChannelRequest), [
+            {"channel_name": f"lease-{i}", "requester_email": "bench@example.com", "visibility": "public", "status": "pending"}
+            for i in range(rows)
+        ])
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--lease-seconds", type=float, default=2.0)
+    parser.add_argument("--crash-one", action="store_true")
+    parser.add_argument("--database-url", help="Defaults to a fresh SQLite file")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='leasebench-')}/lease.db"
+    seed(database_url, args.rows)
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    barrier = context.Barrier(args.processes)
+    processes = [
+        context.Process(
+            target=worker,
+            args=(database_url, i, args.batch, args.lease_seconds, args.crash_one and i == 0, barrier, results),
+        )
+        for i in range(args.processes)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    crashed = {id_ for _, _, ids, crash in outcomes if crash for id_ in ids}
+    finished = Counter(id_ for _, _, ids, crash in outcomes if not crash for id_ in ids)
+    duplicates = [id_ for id_, count in finished.items() if count > 1]
+    missing = args.rows - len(finished)
+
+    for index, owner, ids, crash in sorted(outcomes):
+        print(f"process {index} ({owner}): {'crashed holding' if crash else 'finished'} {len(ids)} rows")
+    print(f"{len(finished)} rows finished in {elapsed:.2f}s ({len(finished) / elapsed:.0f} rows/s)")
+    if crashed:
+        print(f"{len(crashed & set(finished))}/{len(crashed)} rows from the crashed process were reclaimed")
+    if duplicates or missing:
+        print(f"FAILED: {len(duplicates)} rows claimed twice, {missing} rows unfinished")
+        sys.exit(1)
+    print("OK: every row was claimed and finished exactly once")
+
+
+if __name__ == "__main__":
+    main()
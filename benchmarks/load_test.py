@@ -0,0 +1,268 @@
+"""Drive the app under concurrent load against the fake Slack API.
+
+Starts ``benchmarks/fake_slack.py`` and the app on local ports with a throwaway
+SQLite database, then reports p50/p95/p99 latency and requests per second for
+``/forms/webhook``, ``/create-channel`` and ``/slack/interactions``. It also
+reports how long the workers take to drain the queued form submissions, and
+how cheaply forged (badly signed) Slack requests are turned away.
+
+    python -m benchmarks.load_test --requests 500 --concurrency 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+import uuid
+from urllib.parse import urlencode
+from dataclasses import dataclass, field
+
+import httpx
+import uvicorn
+
+from benchmarks.fake_slack import FakeSlackConfig, create_app
+
+ENDPOINTS = ("forms_webhook", "create_channel", "slack_interactions", "slack_forged")
+# Responses other than these count as errors; the default is any status below 400
+EXPECTED_STATUS = {"slack_forged": 401}
+SIGNING_SECRET = "bench-signing-secret"
+
+
+@dataclass
+class Result:
+    name: str
+    latencies: list = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def percentile(self, p: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def row(self) -> dict:
+        count = len(self.latencies)
+        return {
+            "endpoint": self.name,
+            "requests": count,
+            "errors": self.errors,
+            "rps": round(count / self.elapsed, 1) if self.elapsed else 0.0,
+            "mean_ms": round(statistics.fmean(self.latencies) * 1000, 2) if count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+        }
+
+
+def serve(app, port: int) -> uvicorn.Server:
+    """Run ``app`` with uvicorn on a background thread and wait until it accepts requests."""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def form_payload(run: str, i: int, users: int) -> dict:
+    return {
+        "channel_name": f"bench-form-{run}-{i}",
+        "requester_email": f"user{i % users}@example.com",
+        "visibility": "public",
+        "users_to_add": [f"user{(i + k) % users}@example.com" for k in range(1, 4)],
+        "form_submission_id": f"{run}-{i}",
+    }
+
+
+def interaction_payload(run: str, i: int) -> dict:
+    values = {
+        "channel_name_block": {"channel_name_input": {"value": f"bench-modal-{run}-{i}"}},
+        "channel_type_block": {"channel_type_select": {"selected_option": {"value": "Public"}}},
+        "users_block": {"users_select": {"selected_users": ["U00000001", "U00000002"]}},
+    }
+    return {
+        "payload": json.dumps({
+            "type": "view_submission",
+            "user": {"id": "U00000001"},
+            "api_app_id": "ABENCH",
+            "token": "bench",
+            "trigger_id": f"trigger-{i}",
+            "team": {"id": "TFAKE"},
+            "view": {
+                "id": f"VBENCH{i}",
+                "team_id": "TFAKE",
+                "callback_id": "channel_creation_modal",
+                "hash": "bench",
+                "title": {"type": "plain_text", "text": "Create Channel"},
+                "type": "modal",
+                "state": {"values": values},
+            },
+        })
+    }
+
+
+def slack_headers(body: bytes, secret: str = SIGNING_SECRET) -> dict:
+    """Headers Slack would send with ``body``, signed with ``secret``."""
+    timestamp = str(int(time.time()))
+    digest = hmac.new(secret.encode(), f"v0:{timestamp}:".encode() + body, hashlib.sha256).hexdigest()
+    return {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "X-Slack-Request-Timestamp": timestamp,
+        "X-Slack-Signature": f"v0={digest}",
+    }
+
+
+def post_slack(client: httpx.AsyncClient, path: str, data: dict, secret: str = SIGNING_SECRET):
+    body = urlencode(data).encode()
+    return client.post(path, content=body, headers=slack_headers(body, secret))
+
+
+async def drive(client: httpx.AsyncClient, name: str, send, total: int, concurrency: int) -> Result:
+    result = Result(name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await send(i)
+                expected = EXPECTED_STATUS.get(name)
+                ok = response.status_code == expected if expected else response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            result.latencies.append(time.perf_counter() - started)
+            if not ok:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def wait_for_drain(timeout: float) -> tuple[int, int, float]:
+    """Wait until no channel request is pending; returns (completed, failed or dead-lettered, seconds)."""
+    from app.database import SessionLocal
+    from app.models.channel_request import ChannelRequest
+
+    def counts():
+        with SessionLocal() as db:
+            pending = db.query(ChannelRequest).filter(ChannelRequest.status == "pending").count()
+            failed = db.query(ChannelRequest).filter(ChannelRequest.status.in_(("failed", "dead_letter"))).count()
+            return pending, failed, db.query(ChannelRequest).count()
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        pending, failed, total = await asyncio.to_thread(counts)
+        if not pending:
+            break
+        await asyncio.sleep(0.1)
+    return total - pending, failed, time.perf_counter() - started
+
+
+async def run(args, base_url: str) -> list[dict]:
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    rows = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        senders = {
+            "forms_webhook": lambda i: client.post("/forms/webhook", json=form_payload(run_id, i, args.users)),
+            "create_channel": lambda i: client.post(
+                "/create-channel", json={"channel_name": f"bench-direct-{run_id}-{i}", "channel_type": "Public"}
+            ),
+            "slack_interactions": lambda i: post_slack(client, "/slack/interactions", interaction_payload(run_id, i)),
+            "slack_forged": lambda i: post_slack(
+                client, "/slack/interactions", interaction_payload(run_id, i), secret="not-the-secret"
+            ),
+        }
+        for name in args.endpoints:
+            result = await drive(client, name, senders[name], args.requests, args.concurrency)
+            rows.append(result.row())
+            if name == "forms_webhook":
+                completed, failed, seconds = await wait_for_drain(args.drain_timeout)
+                rows.append({
+                    "endpoint": "forms_pipeline_drain",
+                    "requests": completed,
+                    "errors": failed,
+                    "rps": round(completed / (result.elapsed + seconds), 1),
+                    "mean_ms": None,
+                    "p50_ms": None,
+                    "p95_ms": None,
+                    "p99_ms": round((result.elapsed + seconds) * 1000, 2),
+                })
+    return rows
+
+
+def print_table(rows: list[dict]):
+    columns = ("endpoint", "requests", "errors", "rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms")
+    print(" ".join(f"{column:>22}" if i == 0 else f"{column:>9}" for i, column in enumerate(columns)))
+    for row in rows:
+        cells = ["-" if row[column] is None else row[column] for column in columns]
+        print(" ".join(f"{cell:>22}" if i == 0 else f"{cell:>9}" for i, cell in enumerate(cells)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake Slack latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--ratelimit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--name-taken-rate", type=float, default=0.0)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rate-scale", type=float, default=100.0,
+                        help="Multiplier on Slack's rate tiers; 1 reproduces production limits")
+    parser.add_argument("--workers", type=int, default=8, help="Channel request workers")
+    parser.add_argument("--drain-timeout", type=float, default=300.0)
+    parser.add_argument("--slack-port", type=int, default=9100)
+    parser.add_argument("--app-port", type=int, default=9200)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    fake = FakeSlackConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        ratelimit_rate=args.ratelimit_rate,
+        retry_after=args.retry_after,
+        name_taken_rate=args.name_taken_rate,
+        server_error_rate=args.server_error_rate,
+        users=args.users,
+    )
+    serve(create_app(fake), args.slack_port)
+
+    # The app reads its configuration at import time
+    db_dir = tempfile.mkdtemp(prefix="slackbench-")
+    os.environ.update({
+        "SLACK_API_BASE_URL": f"http://127.0.0.1:{args.slack_port}/api/",
+        "SLACK_BOT_TOKEN": "xoxb-bench",
+        "SLACK_SIGNING_SECRET": SIGNING_SECRET,
+        "DATABASE_URL": f"sqlite:///{db_dir}/bench.db",
+        "SLACK_RATE_LIMIT_SCALE": str(args.rate_scale),
+        "CHANNEL_WORKERS": str(args.workers),
+        # Retries of injected server errors are due within the run
+        "CHANNEL_RETRY_BASE_DELAY": "0.5",
+        "CHANNEL_QUEUE_POLL_INTERVAL": "0.5",
+        "LOG_LEVEL": "WARNING",
+    })
+    import main as app_main
+
+    serve(app_main.app, args.app_port)
+
+    rows = asyncio.run(run(args, f"http://127.0.0.1:{args.app_port}"))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
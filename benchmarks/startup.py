@@ -0,0 +1,80 @@
+"""Measure how long the app takes from process start to its first ``/health`` 200.
+
+Each run spawns ``uvicorn main:app`` against the fake Slack API and polls
+``/health`` until it answers. The first run starts on an empty SQLite database,
+so it includes applying the migrations. Later runs reuse that database, the
+usual case for a restart or a scaled-out replica.
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.fake_slack import FakeSlackConfig, create_app
+from benchmarks.load_test import serve
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_to_health(port: int, env: dict, timeout: float) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        with httpx.Client() as client:
+            while time.perf_counter() - started < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with {process.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError(f"/health did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Runs after the first, on the migrated database")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--slack-port", type=int, default=9100)
+    parser.add_argument("--app-port", type=int, default=9300)
+    args = parser.parse_args()
+
+    serve(create_app(FakeSlackConfig()), args.slack_port)
+    db_dir = tempfile.mkdtemp(prefix="startupbench-")
+    env = dict(
+        os.environ,
+        SLACK_API_BASE_URL=f"http://127.0.0.1:{args.slack_port}/api/",
+        SLACK_BOT_TOKEN="xoxb-bench",
+        SLACK_SIGNING_SECRET="bench-signing-secret",
+        DATABASE_URL=f"sqlite:///{db_dir}/startup.db",
+        LOG_LEVEL="WARNING",
+    )
+
+    first = time_to_health(args.app_port, env, args.timeout)
+    print(f"empty database:    {first * 1000:8.1f} ms")
+    warm = [time_to_health(args.app_port, env, args.timeout) for _ in range(args.runs)]
+    if warm:
+        print(
+            f"migrated database: {statistics.median(warm) * 1000:8.1f} ms median, "
+            f"{min(warm) * 1000:.1f} ms best over {len(warm)} runs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,31 +6,77 @@
  * 2. Click 3 dots → Script editor
  * 3. Replace default code with this script
  * 4. Update YOUR_FASTAPI_URL with your actual URL
- * 5. Save and run setupTrigger() once
+ * 5. Set QUESTION_TITLES to your form's question titles
+ * 6. Save and run setupTrigger() once
+ * 7. Optional: set BUFFER_SUBMISSIONS to true and run setupFlushTrigger() once to send
+ *    submissions in batches, or run backfillResponses() to resend every stored response.
+ *    Submissions the server rejects are kept in script properties under 'rejected_submission:'
  */
 
 // ⚠️ IMPORTANT: Replace this with your actual FastAPI URL
 const FASTAPI_URL = 'https://login.theccdocs.com:8443/custom/gateway/gateway.php/forms/webhook';
 // For local testing: 'http://localhost:9000/forms/webhook'
 
+// Batch variant of the webhook: one request carries many submissions
+const FASTAPI_BATCH_URL = FASTAPI_URL + '/batch';
+
+// When true, submissions are stored in script properties and sent in batches by
+// flushSubmissions() instead of one request per response. This saves UrlFetchApp quota.
+const BUFFER_SUBMISSIONS = false;
+const BATCH_SIZE = 100; // Submissions per batch request (the server accepts up to 500)
+const FLUSH_EVERY_MINUTES = 5; // One of 1, 5, 10, 15 or 30
+const BUFFER_PREFIX = 'pending_submission:';
+// Submissions the server rejected are parked here with its reason instead of being resent
+const REJECTED_PREFIX = 'rejected_submission:';
+
+// Title of the form question behind each webhook field - adjust to match your form.
+// Answers are matched by title, so question order and unanswered optional questions do not matter
+const QUESTION_TITLES = {
+  channel_name: 'Channel name',
+  requester_email: 'Email',
+  requester_name: 'Name', // optional
+  visibility: 'Visibility', // optional, defaults to public
+  users_to_add: 'Users to add' // optional, emails separated by commas
+};
+
+/**
+ * Build the webhook payload from a FormResponse
+ */
+function buildChannelRequest(formResponse) {
+  const answers = {};
+  formResponse.getItemResponses().forEach(itemResponse => {
+    answers[itemResponse.getItem().getTitle()] = itemResponse.getResponse();
+  });
+  // Checkbox and grid answers come back as arrays
+  const answer = field => {
+    const value = answers[QUESTION_TITLES[field]];
+    return (Array.isArray(value) ? value.join(',') : String(value || '')).trim();
+  };
+
+  return {
+    channel_name: answer('channel_name'),
+    requester_email: answer('requester_email'),
+    requester_name: answer('requester_name') || null,
+    visibility: answer('visibility').toLowerCase() || 'public',
+    users_to_add: answer('users_to_add').split(/[,;\s]+/).filter(email => email),
+    form_submission_id: formResponse.getId() // Google Form submission ID
+  };
+}
+
 /**
  * Main function triggered when form is submitted
  */
 function onFormSubmit(e) {
   try {
+    const formData = buildChannelRequest(e.response);
     // Log the form response for debugging
-    console.log('Form submitted:', e.values);
-    
-    // Extract form values - adjust indices based on your form field order
-    const formData = {
-      channel_name: e.values[1], // Assuming channel name is 2nd question
-      requester_email: e.values[2], // Assuming email is 3rd question  
-      requester_name: e.values[3], // Assuming name is 4th question (optional)
-      visibility: e.values[4] ? e.values[4].toLowerCase() : 'public', // Assuming visibility is 5th question
-      users_to_add: e.values[5] ? e.values[5].split(',').map(email => email.trim()) : [], // Assuming users is 6th question
-      form_submission_id: e.response.getId() // Google Form submission ID
-    };
-    
+    console.log('Form submitted:', formData);
+
+    if (BUFFER_SUBMISSIONS) {
+      bufferSubmission(formData);
+      return;
+    }
+
     console.log('Sending data to FastAPI:', formData);
     
     // Send POST request to FastAPI webhook
@@ -59,6 +105,107 @@ function onFormSubmit(e) {
   }
 }
 
+/**
+ * Store a submission until the next flushSubmissions() run; flushes early once a batch is full
+ */
+function bufferSubmission(formData) {
+  const properties = PropertiesService.getScriptProperties();
+  properties.setProperty(BUFFER_PREFIX + formData.form_submission_id, JSON.stringify(formData));
+  console.log('Buffered submission', formData.form_submission_id);
+
+  const buffered = Object.keys(properties.getProperties()).filter(key => key.startsWith(BUFFER_PREFIX));
+  if (buffered.length >= BATCH_SIZE) {
+    flushSubmissions();
+  }
+}
+
+/**
+ * Send a list of submissions to the batch endpoint; returns the parsed response
+ */
+function sendBatch(items) {
+  const response = UrlFetchApp.fetch(FASTAPI_BATCH_URL, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    payload: JSON.stringify(items),
+    muteHttpExceptions: true
+  });
+  if (response.getResponseCode() !== 200) {
+    throw new Error('Batch request failed (' + response.getResponseCode() + '): ' + response.getContentText());
+  }
+
+  const result = JSON.parse(response.getContentText());
+  console.log('✅ Batch sent: ' + result.accepted + ' accepted, ' + result.duplicates + ' duplicates, ' + result.rejected + ' rejected');
+  result.items
+    .filter(item => item.status === 'rejected')
+    .forEach(item => console.error('❌ Rejected ' + items[item.index].channel_name + ': ' + item.error));
+  return result;
+}
+
+/**
+ * Send all buffered submissions in batches. Run by the trigger from setupFlushTrigger()
+ */
+function flushSubmissions() {
+  const lock = LockService.getScriptLock();
+  lock.waitLock(30000);
+  try {
+    const properties = PropertiesService.getScriptProperties();
+    const stored = properties.getProperties();
+    const keys = Object.keys(stored).filter(key => key.startsWith(BUFFER_PREFIX));
+
+    for (let start = 0; start < keys.length; start += BATCH_SIZE) {
+      const batchKeys = keys.slice(start, start + BATCH_SIZE);
+      // Replays are safe: the server recognises submissions it already stored
+      const result = sendBatch(batchKeys.map(key => JSON.parse(stored[key])));
+      result.items.forEach(item => {
+        const key = batchKeys[item.index];
+        if (item.status === 'rejected') {
+          // Sending it again would be rejected again; keep it for a person to look at
+          properties.setProperty(
+            REJECTED_PREFIX + key.slice(BUFFER_PREFIX.length),
+            JSON.stringify({ submission: JSON.parse(stored[key]), error: item.error })
+          );
+        }
+        properties.deleteProperty(key);
+      });
+    }
+  } catch (error) {
+    // Whatever was not sent stays buffered for the next run
+    console.error('❌ Flush error:', error.toString());
+  } finally {
+    lock.releaseLock();
+  }
+}
+
+/**
+ * Resend every response stored in the form, in batches. Safe to re-run
+ */
+function backfillResponses() {
+  const items = FormApp.getActiveForm().getResponses().map(buildChannelRequest);
+
+  for (let start = 0; start < items.length; start += BATCH_SIZE) {
+    sendBatch(items.slice(start, start + BATCH_SIZE));
+  }
+  console.log('✅ Backfilled ' + items.length + ' responses');
+}
+
+/**
+ * Set up the periodic flush of buffered submissions - run this function once manually
+ */
+function setupFlushTrigger() {
+  ScriptApp.getProjectTriggers()
+    .filter(trigger => trigger.getHandlerFunction() === 'flushSubmissions')
+    .forEach(trigger => ScriptApp.deleteTrigger(trigger));
+
+  ScriptApp.newTrigger('flushSubmissions')
+    .timeBased()
+    .everyMinutes(FLUSH_EVERY_MINUTES)
+    .create();
+
+  console.log('✅ Flush trigger set up to run every ' + FLUSH_EVERY_MINUTES + ' minutes');
+}
+
 /**
  * Set up the form submit trigger - run this function once manually
  */
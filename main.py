@@ -1,18 +1,55 @@
 from fastapi import FastAPI
-from app.database import Base, engine
+from sqlalchemy.orm import Session
+from app.database import engine, async_engine
+from app.logging_config import configure_logging, stop_logging
+from app.migrations import ensure_schema
 import logging
-
-logging.basicConfig(level=logging.INFO)
-from app.routers import forms, slack
+from app.routers import forms, slack, channels, channel_requests, metrics, admin
+from app.middleware import RequestContextMiddleware, SlackSignatureMiddleware
+from app.services.slack_service import SLACK_SIGNING_SECRET, close_async_client, workspaces
+from app.services.channel_queue import channel_queue
+from app.services.status_writer import status_writer
+from app.services.retention import retention
+from app.services.metrics import instrument_sessions
 
 app = FastAPI()
+if SLACK_SIGNING_SECRET:
+    app.add_middleware(SlackSignatureMiddleware, signing_secret=SLACK_SIGNING_SECRET)
+else:
+    logging.getLogger(__name__).warning("SLACK_SIGNING_SECRET not set, Slack request signatures are not verified")
+# Added last so it runs first, and signature rejections are logged with the request ID
+app.add_middleware(RequestContextMiddleware)
+# Covers sync sessions and the sync sessions behind AsyncSession
+instrument_sessions(Session)
 
 @app.on_event("startup")
 async def startup_event():
-    Base.metadata.create_all(bind=engine)
+    # Under uvicorn this runs after its own logging setup, and importing the app stays side-effect free
+    configure_logging()
+    # One SELECT of alembic_version; migrations only run if the schema is behind
+    ensure_schema(engine)
+    await status_writer.start()
+    await channel_queue.start()
+    # Loads the default workspace's channel index (and user cache, if enabled);
+    # other workspaces load theirs when their first request arrives
+    await workspaces.start()
+    await retention.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await retention.stop()
+    await channel_queue.stop()
+    await status_writer.stop()
+    await close_async_client()
+    await async_engine.dispose()
+    stop_logging()
 
 app.include_router(forms.router)
 app.include_router(slack.router)
+app.include_router(channels.router)
+app.include_router(channel_requests.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 @app.get("/health")
 async def health():